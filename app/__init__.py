@@ -1,18 +1,26 @@
+import time
 from flask import Blueprint, Flask
 from .extensions import db, login_manager
 from flask_migrate import Migrate
 
 from .config import config
+from .database import init_database
 
 def create_app(config_name='default'):
     """Create and configure the Flask application."""
+    started = time.perf_counter()
+    timings = {}
+    
     app = Flask(__name__,template_folder='templates')
     app.config.from_object(config[config_name])
+    app.config['CONFIG_NAME'] = config_name
     
     # Initialize extensions with app
-    db.init_app(app)
+    init_database(app, db)
     login_manager.init_app(app)
     migrate = Migrate(app, db)
+    timings['extensions'] = time.perf_counter() - started
+    
     main = Blueprint('main', __name__, template_folder='templates')
     # Register blueprints
     from .routes.main import main as main_blueprint
@@ -29,9 +37,32 @@ def create_app(config_name='default'):
     
     from .routes.common import common_bp as common_blueprint
     app.register_blueprint(common_blueprint)
+    timings['blueprints'] = time.perf_counter() - started - sum(timings.values())
+    
+    from .cli import register_commands
+    register_commands(app)
     
     # Create upload folder if it doesn't exist
     import os
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
+    # Model and NLP data are otherwise loaded on first scoring use
+    if app.config.get('WARMUP_ON_STARTUP'):
+        from .services.cv_matching_service import CVMatchingService
+        with app.app_context():
+            CVMatchingService.warmup()
+        timings['warmup'] = time.perf_counter() - started - sum(timings.values())
+    
+    if app.config.get('INGESTION_THREADS'):
+        from .services.ingestion_service import IngestionService
+        IngestionService.start_threads(app, app.config['INGESTION_THREADS'])
+    
+    timings['total'] = time.perf_counter() - started
+    app.config['STARTUP_TIMINGS'] = timings
+    app.logger.info(
+        "create_app('%s') took %.3fs (%s)",
+        config_name, timings['total'],
+        ', '.join(f'{name} {seconds:.3f}s' for name, seconds in timings.items() if name != 'total')
+    )
+    
     return app
@@ -1 +1,7 @@
-from .cv_matcher import CVMatcher
\ No newline at end of file
+# Heavy dependencies (sklearn, pandas, NLTK) are only imported on first use
+
+def __getattr__(name):
+    if name == 'CVMatcher':
+        from .cv_matcher import CVMatcher
+        return CVMatcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
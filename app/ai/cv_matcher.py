@@ -1,7 +1,8 @@
 import os
+import hashlib
 import numpy as np
-import pandas as pd
 import pickle
+from scipy import sparse
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
@@ -9,30 +10,72 @@ from sklearn.preprocessing import StandardScaler
 
 from .text_processor import TextProcessor
 from .feature_extractor import FeatureExtractor
+from .preprocessing import preprocess_dataset, process_texts
+from .model_artifact import save_bundle, load_bundle
 
 class CVMatcher:
     """CV Matcher model for predicting resume-job match."""
     
-    def __init__(self):
+    def __init__(self, fast_tokenizer=None):
         self.model = None
-        self.text_processor = TextProcessor()
+        self.text_processor = TextProcessor(fast_tokenizer=fast_tokenizer)
         self.feature_extractor = FeatureExtractor()
-        self.scaler = StandardScaler()
+        # Centering would densify the sparse feature matrix, so only scale
+        self.scaler = StandardScaler(with_mean=False)
+        self._model_hash = None
+        self.metadata = {}
+        self.metrics = {}
     
-    def load_model(self, model_path):
-        """Load a trained model from file."""
+    @property
+    def model_version(self):
+        """Identify the model and feature extractor that produce scores."""
+        if not self.model:
+            return 'untrained'
+        if self._model_hash is None:
+            self._model_hash = hashlib.sha256(pickle.dumps(self.model)).hexdigest()[:16]
+        return f'{self._model_hash}-{self.features_version}'
+    
+    @property
+    def features_version(self):
+        """Identify the fitted vectorizer and skill taxonomy behind features.
+        
+        None while the vectorizer is not fitted, in which case TF-IDF
+        vectors are never stored.
+        """
+        if self.feature_extractor.version is None:
+            return None
+        fingerprint = self.text_processor.skill_taxonomy.fingerprint or 'builtin'
+        return f'{self.feature_extractor.version}-{fingerprint[:8]}'
+    
+    def load_model(self, model_path, version=None):
+        """Load a trained model.
+        
+        `model_path` is either a model bundle directory (see
+        `model_artifact`), loaded with memory-mapped arrays, or a legacy
+        pickle holding only the classifier.
+        """
+        if os.path.isdir(model_path):
+            try:
+                self.metadata = load_bundle(self, model_path, version=version)
+            except FileNotFoundError:
+                return False
+            self._model_hash = self.metadata['model_hash']
+            self.metrics = self.metadata.get('metrics', {})
+            return True
+        
         if os.path.exists(model_path):
             with open(model_path, 'rb') as f:
-                self.model = pickle.load(f)
+                data = f.read()
+            self.model = pickle.loads(data)
+            self._model_hash = hashlib.sha256(data).hexdigest()[:16]
             return True
         return False
     
     def save_model(self, model_path):
-        """Save the trained model to file."""
+        """Save the trained model, scaler and vectorizer as a new bundle version."""
         if self.model:
-            os.makedirs(os.path.dirname(model_path), exist_ok=True)
-            with open(model_path, 'wb') as f:
-                pickle.dump(self.model, f)
+            version = save_bundle(self, model_path, metrics=self.metrics)
+            self.load_model(model_path, version=version)
             return True
         return False
     
@@ -49,47 +92,48 @@ class CVMatcher:
         return df
     
     def extract_features(self, df):
-        """Extract features from preprocessed data."""
-        # Create a list to store all feature arrays
-        all_features = []
-        
-        # Extract TF-IDF features for all document pairs
-        all_documents = list(df['processed_resume']) + list(df['processed_job'])
-        self.feature_extractor.fit(all_documents)
-        
-        # Extract features for each resume-job pair
-        for i, row in df.iterrows():
-            # Extract text features
-            text_features = self.feature_extractor.extract_combined_features(
-                row['processed_resume'], 
-                row['processed_job']
-            )
-            
-            # Extract skills features
-            skills_features = self.feature_extractor.extract_skills_features(
-                row['resume_skills'],
-                row['job_skills']
-            )
-            
-            # Combine features
-            combined_features = np.hstack((text_features, skills_features))
-            all_features.append(combined_features)
+        """Extract features from preprocessed data.
+        
+        All resumes and all job descriptions are transformed in one call
+        each, and pair features are computed as matrix operations over the
+        whole dataset.
+        """
+        processed_resumes = list(df['processed_resume'])
+        processed_jobs = list(df['processed_job'])
+        
+        # Fit TF-IDF on all documents
+        self.feature_extractor.fit(processed_resumes + processed_jobs)
         
-        # Convert list of arrays to a single array
-        X = np.vstack(all_features)
+        # Extract text features for all pairs
+        text_features = self.feature_extractor.combine_vectors(
+            self.feature_extractor.transform(processed_resumes),
+            self.feature_extractor.transform(processed_jobs)
+        )
+        
+        # Extract skills features for all pairs
+        skills_features = self.feature_extractor.extract_skills_features_batch(
+            list(df['resume_skills']),
+            list(df['job_skills'])
+        )
+        
+        # Combine features
+        X = sparse.hstack((text_features, skills_features), format='csr')
         
         # Scale features
         X = self.scaler.fit_transform(X)
         
         return X
     
-    def train(self, data_path):
-        """Train the model using the dataset."""
-        # Load dataset
-        df = pd.read_csv(data_path)
+    def train(self, data_path, workers=None, cache_path=None):
+        """Train the model using the dataset.
         
-        # Preprocess data
-        df = self.preprocess_data(df)
+        Text preprocessing is streamed in chunks across `workers` processes
+        and optionally cached at `cache_path`, see `preprocess_dataset`.
+        """
+        # Load and preprocess dataset
+        df = preprocess_dataset(
+            data_path, cache_path=cache_path, workers=workers, processor=self.text_processor
+        )
         
         # Extract features
         X = self.extract_features(df)
@@ -107,6 +151,7 @@ class CVMatcher:
             class_weight='balanced'
         )
         self.model.fit(X_train, y_train)
+        self._model_hash = None
         
         # Evaluate model
         y_pred = self.model.predict(X_test)
@@ -116,39 +161,139 @@ class CVMatcher:
         f1 = f1_score(y_test, y_pred)
         
         # Return metrics
-        return {
-            'accuracy': accuracy,
-            'precision': precision,
-            'recall': recall,
-            'f1': f1
+        self.metrics = {
+            'accuracy': float(accuracy),
+            'precision': float(precision),
+            'recall': float(recall),
+            'f1': float(f1)
         }
+        return self.metrics
     
     def predict_match(self, resume_text, job_description):
         """Predict match percentage between resume and job description."""
+        return self.predict_match_batch(resume_text, [job_description])[0]
+    
+    def compute_features(self, texts, executor=None):
+        """Compute the per-document features used for matching.
+        
+        Returns one dict per text holding the processed text, the extracted
+        skills and, when the vectorizer is fitted, the TF-IDF vector with the
+        extractor version it was computed with. These can be stored and
+        passed back to `predict_match_features` later. With an executor from
+        `preprocessing.create_executor` the text pipeline runs in its workers.
+        """
+        texts = list(texts)
+        if executor is None:
+            processed_texts = [self.text_processor.process_text(text) for text in texts]
+            skills = [self.text_processor.extract_skills(text) for text in texts]
+        else:
+            processed_texts, skills = process_texts(texts, executor)
+        
+        tfidf_vectors = [None] * len(texts)
+        if self.feature_extractor.is_fitted and texts:
+            tfidf_matrix = self.feature_extractor.transform(processed_texts)
+            tfidf_vectors = [tfidf_matrix[i] for i in range(tfidf_matrix.shape[0])]
+        
+        return [
+            {
+                'processed_text': processed,
+                'skills': text_skills,
+                'tfidf': vector,
+                'extractor_version': self.features_version
+            }
+            for processed, text_skills, vector in zip(processed_texts, skills, tfidf_vectors)
+        ]
+    
+    def compute_job_features(self, job_texts, executor=None):
+        """Compute matching features for job descriptions."""
+        return self.compute_features(job_texts, executor)
+    
+    def compute_resume_features(self, resume_texts, executor=None):
+        """Compute matching features for resumes."""
+        return self.compute_features(resume_texts, executor)
+    
+    def predict_match_batch(self, resume_text, job_texts):
+        """Predict match scores between one resume and many job descriptions.
+        
+        The resume is processed once and the model is called a single time
+        for all jobs. Scores are returned in the order of `job_texts`.
+        """
+        job_texts = list(job_texts)
+        if not job_texts:
+            return []
+        
         if not self.model:
             # Return default score if model is not trained
-            return 0.5
+            return [0.5] * len(job_texts)
         
-        # Preprocess texts
-        processed_resume = self.text_processor.process_text(resume_text)
-        processed_job = self.text_processor.process_text(job_description)
+        return self.predict_match_features(
+            self.compute_resume_features([resume_text]),
+            self.compute_job_features(job_texts)
+        )
+    
+    def predict_resumes_batch(self, resume_texts, job_description):
+        """Predict match scores between many resumes and one job description.
         
-        # Extract skills
-        resume_skills = self.text_processor.extract_skills(resume_text)
-        job_skills = self.text_processor.extract_skills(job_description)
+        The job description is processed once and the model is called a
+        single time for all resumes. Scores are returned in the order of
+        `resume_texts`.
+        """
+        resume_texts = list(resume_texts)
+        if not resume_texts:
+            return []
         
-        # Extract text features
-        text_features = self.feature_extractor.extract_combined_features(
-            processed_resume, processed_job
+        if not self.model:
+            # Return default score if model is not trained
+            return [0.5] * len(resume_texts)
+        
+        return self.predict_match_features(
+            self.compute_resume_features(resume_texts),
+            self.compute_job_features([job_description])
         )
+    
+    def predict_match_features(self, resume_features, job_features):
+        """Predict match scores from precomputed resume and job features.
+        
+        Both arguments are lists of dicts as returned by `compute_features`.
+        A single entry on either side is scored against every entry on the
+        other side. Stored TF-IDF vectors are only used when they were
+        computed by the currently fitted vectorizer; otherwise the processed
+        texts are transformed again.
+        """
+        resume_features = list(resume_features)
+        job_features = list(job_features)
+        n_pairs = max(len(resume_features), len(job_features))
+        if not resume_features or not job_features:
+            return []
+        
+        if not self.model:
+            # Return default score if model is not trained
+            return [0.5] * n_pairs
+        
+        # Extract text features
+        version = self.features_version
+        if version and all(
+            features.get('tfidf') is not None and features.get('extractor_version') == version
+            for features in resume_features + job_features
+        ):
+            text_features = self.feature_extractor.combine_vectors(
+                sparse.vstack([features['tfidf'] for features in resume_features]),
+                sparse.vstack([features['tfidf'] for features in job_features])
+            )
+        else:
+            text_features = self.feature_extractor.extract_combined_features_batch(
+                [features['processed_text'] for features in resume_features],
+                [features['processed_text'] for features in job_features]
+            )
         
         # Extract skills features
-        skills_features = self.feature_extractor.extract_skills_features(
-            resume_skills, job_skills
+        skills_features = self.feature_extractor.extract_skills_features_batch(
+            [features['skills'] for features in resume_features],
+            [features['skills'] for features in job_features]
         )
         
         # Combine features
-        combined_features = np.hstack((text_features, skills_features))
+        combined_features = sparse.hstack((text_features, skills_features), format='csr')
         
         # Scale features
         X = self.scaler.transform(combined_features)
@@ -156,9 +301,7 @@ class CVMatcher:
         # Make prediction
         if hasattr(self.model, 'predict_proba'):
             # If model supports probability prediction
-            match_proba = self.model.predict_proba(X)[0][1]
-            return match_proba
+            return [float(p) for p in self.model.predict_proba(X)[:, 1]]
         else:
             # Binary prediction
-            match_pred = self.model.predict(X)[0]
-            return float(match_pred)
\ No newline at end of file
+            return [float(p) for p in self.model.predict(X)]
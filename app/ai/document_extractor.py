@@ -0,0 +1,194 @@
+import multiprocessing
+import os
+import threading
+
+class ExtractionError(Exception):
+    """Raised when text cannot be extracted from a document."""
+
+def _read_pdf(file_path, max_pages):
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:  # PyPDF2 < 1.28
+        from PyPDF2 import PdfFileReader as PdfReader
+    
+    reader = PdfReader(file_path, strict=False)
+    encrypted = getattr(reader, 'is_encrypted', None)
+    if encrypted is None:  # PyPDF2 < 2.0
+        encrypted = reader.isEncrypted
+    if encrypted:
+        # Many PDFs are "encrypted" with an empty user password
+        try:
+            reader.decrypt('')
+        except Exception as e:
+            raise ExtractionError(f'Encrypted PDF: {e}')
+    
+    texts = []
+    # Pages are parsed one at a time so the page limit also bounds work
+    for number, page in enumerate(reader.pages):
+        if max_pages and number >= max_pages:
+            break
+        extract = getattr(page, 'extract_text', None) or page.extractText
+        texts.append(extract() or '')
+    return '\n'.join(texts)
+
+def _read_docx(file_path, max_pages):
+    import docx
+    
+    document = docx.Document(file_path)
+    texts = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            texts.append(' '.join(cell.text for cell in row.cells))
+    return '\n'.join(text for text in texts if text)
+
+def _read_plain(file_path, max_pages):
+    with open(file_path, 'rb') as f:
+        return f.read().decode('utf-8', errors='replace')
+
+READERS = {
+    'pdf': _read_pdf,
+    'docx': _read_docx,
+    'txt': _read_plain
+}
+
+def detect_format(file_path):
+    """Guess a document format from its magic bytes, then its extension."""
+    with open(file_path, 'rb') as f:
+        head = f.read(4)
+    if head.startswith(b'%PDF'):
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        return 'docx'
+    extension = os.path.splitext(file_path)[1].lower().lstrip('.')
+    return extension if extension in READERS else 'txt'
+
+def extract_text(file_path, max_pages=None):
+    """Extract the text of a PDF, DOCX or plain text document in this process."""
+    try:
+        return READERS[detect_format(file_path)](file_path, max_pages)
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f'{type(e).__name__}: {e}')
+
+def _worker_main(connection, max_pages, memory_limit):
+    """Loop of a pool process: receive a path, send back (ok, text or error)."""
+    if memory_limit:
+        try:
+            import resource
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except (ImportError, ValueError, OSError):
+            pass
+    
+    while True:
+        try:
+            file_path = connection.recv()
+        except EOFError:
+            return
+        if file_path is None:
+            return
+        try:
+            connection.send((True, extract_text(file_path, max_pages)))
+        except MemoryError:
+            connection.send((False, 'Document exceeds the extraction memory limit'))
+            return
+        except ExtractionError as e:
+            connection.send((False, str(e)))
+
+class _Worker:
+    def __init__(self, context, max_pages, memory_limit):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection, max_pages, memory_limit), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.tasks = 0
+    
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.connection.close()
+
+class ExtractionPool:
+    """Bounded pool of extraction processes with a per-document time limit.
+    
+    Parsing runs in separate processes so that a malformed or hostile
+    document cannot block or crash the caller. A document that exceeds
+    `timeout` seconds has its worker killed and replaced; workers are also
+    recycled after `max_tasks` documents and run under an address space
+    limit of `memory_limit` bytes where the platform supports it.
+    """
+    
+    def __init__(self, workers=2, timeout=20, max_pages=50, memory_limit=None, max_tasks=200):
+        self.size = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.memory_limit = memory_limit
+        self.max_tasks = max_tasks
+        self._context = multiprocessing.get_context('spawn')
+        self._slots = threading.BoundedSemaphore(workers)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def _acquire(self):
+        self._slots.acquire()
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise ExtractionError('Extraction pool is closed')
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return _Worker(self._context, self.max_pages, self.memory_limit)
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def _release(self, worker, broken=False):
+        worker.tasks += 1
+        broken = broken or not worker.process.is_alive()
+        with self._lock:
+            keep = not (broken or self._closed or worker.tasks >= self.max_tasks)
+            if keep:
+                self._idle.append(worker)
+        if not keep:
+            worker.stop(kill=broken)
+        self._slots.release()
+    
+    def extract(self, file_path):
+        """Extract the text of a document, raising ExtractionError on failure or timeout."""
+        worker = self._acquire()
+        try:
+            worker.connection.send(os.path.abspath(file_path))
+            if not worker.connection.poll(self.timeout):
+                self._release(worker, broken=True)
+                raise ExtractionError(f'Extraction timed out after {self.timeout}s')
+            ok, result = worker.connection.recv()
+        except ExtractionError:
+            raise
+        except (EOFError, OSError) as e:
+            self._release(worker, broken=True)
+            raise ExtractionError(f'Extraction worker died: {e}')
+        
+        self._release(worker)
+        if not ok:
+            raise ExtractionError(result)
+        return result
+    
+    def close(self):
+        """Stop idle workers; busy workers are stopped when they finish."""
+        with self._lock:
+            self._closed = True
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.stop()
@@ -1,17 +1,43 @@
+import hashlib
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 
+# Bump when the way features are computed changes, so that stored
+# features computed by an older extractor are recomputed.
+EXTRACTOR_VERSION = '1'
+
 class FeatureExtractor:
     """Extract features from resumes and job descriptions."""
     
     def __init__(self):
         self.tfidf_vectorizer = TfidfVectorizer(max_features=1000)
         self.is_fitted = False
+        self.version = None
     
     def fit(self, documents):
         """Fit the TF-IDF vectorizer on documents."""
         self.tfidf_vectorizer.fit(documents)
         self.is_fitted = True
+        self.version = self._compute_version()
+    
+    def set_vectorizer(self, vectorizer):
+        """Use an already fitted TF-IDF vectorizer, e.g. from a model bundle."""
+        self.tfidf_vectorizer = vectorizer
+        self.is_fitted = True
+        self.version = self._compute_version()
+    
+    def _compute_version(self):
+        """Identify the fitted vectorizer so stored vectors can be validated."""
+        digest = hashlib.sha1()
+        for term, index in sorted(self.tfidf_vectorizer.vocabulary_.items()):
+            digest.update(f'{term}:{index};'.encode('utf-8'))
+        digest.update(self.tfidf_vectorizer.idf_.tobytes())
+        return f'{EXTRACTOR_VERSION}-{digest.hexdigest()[:16]}'
+    
+    def transform(self, documents):
+        """Transform documents into TF-IDF vectors with the fitted vectorizer."""
+        return self.tfidf_vectorizer.transform(documents)
     
     def extract_tfidf_features(self, documents):
         """Extract TF-IDF features from documents."""
@@ -21,31 +47,57 @@ class FeatureExtractor:
     
     def extract_combined_features(self, resume_text, job_description):
         """Extract combined features from resume and job description."""
+        return self.extract_combined_features_batch([resume_text], [job_description])
+    
+    def extract_combined_features_batch(self, resume_texts, job_descriptions):
+        """Extract combined features for many resume-job pairs at once.
+        
+        Each side is transformed in a single call. Passing a single resume
+        with many job descriptions (or the reverse) scores the single
+        document against every document on the other side.
+        """
         if not self.is_fitted:
-            self.fit([resume_text, job_description])
+            self.fit(list(resume_texts) + list(job_descriptions))
+        
+        resume_vectors = self.tfidf_vectorizer.transform(resume_texts)
+        job_vectors = self.tfidf_vectorizer.transform(job_descriptions)
+        
+        return self.combine_vectors(resume_vectors, job_vectors)
+    
+    def combine_vectors(self, resume_vectors, job_vectors):
+        """Combine TF-IDF vectors into sparse pair features.
         
-        resume_vector = self.tfidf_vectorizer.transform([resume_text])
-        job_vector = self.tfidf_vectorizer.transform([job_description])
+        Either side may be a single row, in which case it is broadcast
+        against every row of the other side. The result is a CSR matrix so
+        the mostly-zero TF-IDF blocks are never materialized densely.
+        """
+        resume_vectors = sparse.csr_matrix(resume_vectors)
+        job_vectors = sparse.csr_matrix(job_vectors)
+        n_rows = max(resume_vectors.shape[0], job_vectors.shape[0])
+        if resume_vectors.shape[0] != n_rows:
+            resume_vectors = resume_vectors[np.zeros(n_rows, dtype=np.intp)]
+        if job_vectors.shape[0] != n_rows:
+            job_vectors = job_vectors[np.zeros(n_rows, dtype=np.intp)]
         
         # Combine features
         # You can try different methods of combining features
         # 1. Concatenate vectors
-        # combined = np.hstack((resume_vector.toarray(), job_vector.toarray()))
-        
-        # 2. Compute similarity features
-        similarity = resume_vector.dot(job_vector.T).toarray()[0][0]
+        # combined = sparse.hstack((resume_vectors, job_vectors))
         
         # 3. Element-wise operations
-        difference = np.abs(resume_vector.toarray() - job_vector.toarray())
-        product = resume_vector.toarray() * job_vector.toarray()
+        difference = abs(resume_vectors - job_vectors)
+        product = resume_vectors.multiply(job_vectors).tocsr()
         
-        combined = np.hstack((
-            resume_vector.toarray(), 
-            job_vector.toarray(),
+        # 2. Compute similarity features
+        similarity = sparse.csr_matrix(np.asarray(product.sum(axis=1)))
+        
+        combined = sparse.hstack((
+            resume_vectors, 
+            job_vectors,
             difference,
             product,
-            np.array([[similarity]])
-        ))
+            similarity
+        ), format='csr')
         
         return combined
     
@@ -64,4 +116,62 @@ class FeatureExtractor:
             [len(common_skills), skill_match_ratio, resume_skill_coverage]
         ])
         
-        return features
\ No newline at end of file
+        return features
+    
+    def extract_skills_features_batch(self, resume_skills_list, job_skills_list):
+        """Extract skills match features for many resume-job pairs.
+        
+        Like `extract_combined_features_batch`, a single entry on either
+        side is paired with every entry on the other side. Skill lists are
+        encoded as binary sparse matrices so the match counts for all pairs
+        come out of a single element-wise product.
+        """
+        resume_skills_list = list(resume_skills_list)
+        job_skills_list = list(job_skills_list)
+        if len(resume_skills_list) == 1:
+            resume_skills_list = resume_skills_list * len(job_skills_list)
+        elif len(job_skills_list) == 1:
+            job_skills_list = job_skills_list * len(resume_skills_list)
+        
+        if not job_skills_list:
+            return np.zeros((0, 3))
+        
+        vocabulary = {}
+        resume_matrix = self._skills_matrix(resume_skills_list, vocabulary)
+        job_matrix = self._skills_matrix(job_skills_list, vocabulary)
+        n_skills = len(vocabulary)
+        resume_matrix.resize((resume_matrix.shape[0], n_skills))
+        job_matrix.resize((job_matrix.shape[0], n_skills))
+        
+        # Calculate skill match metrics
+        common_counts = np.asarray(resume_matrix.multiply(job_matrix).sum(axis=1)).ravel()
+        resume_counts = np.array([0 if skills is None else len(skills) for skills in resume_skills_list])
+        job_counts = np.array([0 if skills is None else len(skills) for skills in job_skills_list])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skill_match_ratio = np.where(job_counts > 0, common_counts / job_counts, 0)
+            resume_skill_coverage = np.where(resume_counts > 0, common_counts / resume_counts, 0)
+        
+        features = np.column_stack((common_counts, skill_match_ratio, resume_skill_coverage))
+        
+        # Pairs with no skills on either side get no skills signal at all
+        features[(resume_counts == 0) | (job_counts == 0)] = 0
+        
+        return features
+    
+    @staticmethod
+    def _skills_matrix(skills_list, vocabulary):
+        """Encode skill lists as a binary CSR matrix, extending the vocabulary."""
+        indptr = [0]
+        indices = []
+        for skills in skills_list:
+            # Skill lists read back from the Parquet cache are numpy arrays
+            skills = [] if skills is None else skills
+            columns = {vocabulary.setdefault(skill, len(vocabulary)) for skill in skills}
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+        
+        return sparse.csr_matrix(
+            (np.ones(len(indices)), np.array(indices, dtype=np.int32), np.array(indptr)),
+            shape=(len(skills_list), max(len(vocabulary), 1))
+        )
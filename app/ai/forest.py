@@ -0,0 +1,112 @@
+import numpy as np
+from scipy import sparse
+
+class FlatForest:
+    """Tree ensemble stored as flat node arrays for prediction.
+    
+    The nodes of all trees of a fitted sklearn forest are concatenated
+    into plain numpy arrays. Loaded with `np.load(mmap_mode='r')` these
+    arrays are shared page for page by every process mapping the same
+    files, unlike unpickled sklearn trees which copy their nodes into
+    private memory. Predictions match the source forest's predict_proba.
+    """
+    
+    ARRAYS = ('left', 'right', 'feature', 'threshold', 'value', 'roots', 'classes')
+    
+    def __init__(self, left, right, feature, threshold, value, roots, classes):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value  # per-node class probabilities
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = None
+        # Only columns the trees split on are ever read from the input
+        self.used_features = np.unique(feature[left != -1])
+        self._column = np.zeros(int(self.used_features.max()) + 1 if len(self.used_features) else 1, dtype=np.int64)
+        self._column[self.used_features] = np.arange(len(self.used_features))
+    
+    @classmethod
+    def from_estimator(cls, forest):
+        """Flatten a fitted sklearn forest classifier."""
+        left, right, feature, threshold, value, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            left.append(np.where(is_leaf, -1, tree.children_left + offset))
+            right.append(np.where(is_leaf, -1, tree.children_right + offset))
+            feature.append(tree.feature)
+            threshold.append(tree.threshold)
+            
+            node_values = tree.value[:, 0, :].astype(np.float64)
+            totals = node_values.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1
+            value.append(node_values / totals)
+            
+            roots.append(offset)
+            offset += tree.node_count
+        
+        flat = cls(
+            np.concatenate(left).astype(np.int64),
+            np.concatenate(right).astype(np.int64),
+            np.concatenate(feature).astype(np.int64),
+            np.concatenate(threshold).astype(np.float64),
+            np.concatenate(value),
+            np.array(roots, dtype=np.int64),
+            np.asarray(forest.classes_)
+        )
+        flat.n_features_in_ = getattr(forest, 'n_features_in_', None)
+        return flat
+    
+    def save(self, directory):
+        """Write each array to `<directory>/forest_<name>.npy`."""
+        for name in self.ARRAYS:
+            array = self.classes_ if name == 'classes' else getattr(self, name)
+            np.save(f'{directory}/forest_{name}.npy', np.asarray(array))
+    
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Load a forest saved with `save`, memory-mapping its arrays."""
+        arrays = {
+            name: np.load(
+                f'{directory}/forest_{name}.npy',
+                mmap_mode=None if name == 'classes' else mmap_mode,
+                allow_pickle=name == 'classes'
+            )
+            for name in cls.ARRAYS
+        }
+        return cls(**arrays)
+    
+    def predict_proba(self, X):
+        """Average the leaf class probabilities of all trees."""
+        n_samples = X.shape[0]
+        
+        # Sklearn trees compare float32 inputs against float64 thresholds
+        if sparse.issparse(X):
+            X = sparse.csr_matrix(X)[:, self.used_features].toarray()
+        else:
+            X = np.asarray(X)[:, self.used_features]
+        X = X.astype(np.float32)
+        
+        n_trees = len(self.roots)
+        nodes = np.repeat(np.asarray(self.roots), n_samples)
+        rows = np.tile(np.arange(n_samples), n_trees)
+        
+        # Walk all trees for all samples one level at a time
+        active = np.asarray(self.left)[nodes] != -1
+        while active.any():
+            current = nodes[active]
+            features = self._column[np.asarray(self.feature)[current]]
+            go_left = X[rows[active], features] <= np.asarray(self.threshold)[current]
+            nodes[active] = np.where(
+                go_left, np.asarray(self.left)[current], np.asarray(self.right)[current]
+            )
+            active[active] = np.asarray(self.left)[nodes[active]] != -1
+        
+        proba = np.asarray(self.value)[nodes].reshape(n_trees, n_samples, -1)
+        return proba.mean(axis=0)
+    
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
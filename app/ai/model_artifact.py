@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime
+
+import joblib
+import sklearn
+
+from .forest import FlatForest
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 1
+
+# Name of the file in the bundle root that points at the current version
+CURRENT_FILE = 'CURRENT'
+
+def _atomic_write(path, data):
+    tmp_path = f'{path}.tmp-{uuid.uuid4().hex}'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def save_bundle(cv_matcher, root_dir, metrics=None):
+    """Save a trained CVMatcher as a new version of a model bundle.
+    
+    A version directory holds the forest as flat .npy arrays, the fitted
+    TF-IDF vectorizer and scaler, and metadata.json (versions, taxonomy
+    fingerprint, metrics). It is written under a temporary name and
+    renamed into place before CURRENT is switched to it, so readers
+    never see a partial bundle. Returns the new version id.
+    """
+    os.makedirs(root_dir, exist_ok=True)
+    tmp_dir = os.path.join(root_dir, f'.tmp-{uuid.uuid4().hex}')
+    os.makedirs(tmp_dir)
+    
+    try:
+        model = cv_matcher.model
+        if hasattr(model, 'estimators_'):
+            forest = model if isinstance(model, FlatForest) else FlatForest.from_estimator(model)
+            forest.save(tmp_dir)
+            model_type = 'flat_forest'
+        else:
+            joblib.dump(model, os.path.join(tmp_dir, 'model.joblib'))
+            model_type = 'joblib'
+        
+        joblib.dump(cv_matcher.feature_extractor.tfidf_vectorizer, os.path.join(tmp_dir, 'vectorizer.joblib'))
+        joblib.dump(cv_matcher.scaler, os.path.join(tmp_dir, 'scaler.joblib'))
+        
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(tmp_dir)):
+            with open(os.path.join(tmp_dir, name), 'rb') as f:
+                digest.update(name.encode('utf-8'))
+                digest.update(f.read())
+        model_hash = digest.hexdigest()[:16]
+        version = f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{model_hash[:8]}"
+        
+        metadata = {
+            'format': BUNDLE_FORMAT,
+            'version': version,
+            'model_type': model_type,
+            'model_hash': model_hash,
+            'created_at': datetime.utcnow().isoformat(),
+            'extractor_version': cv_matcher.feature_extractor.version,
+            'skill_taxonomy_fingerprint': cv_matcher.text_processor.skill_taxonomy.fingerprint,
+            'sklearn_version': sklearn.__version__,
+            'metrics': metrics or {}
+        }
+        _atomic_write(os.path.join(tmp_dir, 'metadata.json'), json.dumps(metadata, indent=2))
+        
+        os.replace(tmp_dir, os.path.join(root_dir, version))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    
+    _atomic_write(os.path.join(root_dir, CURRENT_FILE), version)
+    return version
+
+def read_metadata(root_dir, version=None):
+    """Read the metadata of a bundle version (the current one by default)."""
+    version = version or current_version(root_dir)
+    with open(os.path.join(root_dir, version, 'metadata.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+def current_version(root_dir):
+    """Get the version CURRENT points at, or None for an empty bundle."""
+    path = os.path.join(root_dir, CURRENT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return f.read().strip() or None
+
+def load_bundle(cv_matcher, root_dir, version=None, mmap_mode='r'):
+    """Load a bundle version into a CVMatcher.
+    
+    Numpy arrays are memory-mapped, so processes loading the same version
+    share the pages of the forest instead of each holding a copy.
+    Returns the bundle metadata.
+    """
+    version = version or current_version(root_dir)
+    if version is None:
+        raise FileNotFoundError(f"No model bundle in {root_dir}")
+    
+    bundle_dir = os.path.join(root_dir, version)
+    metadata = read_metadata(root_dir, version)
+    if metadata['format'] != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported model bundle format {metadata['format']}")
+    
+    if metadata['model_type'] == 'flat_forest':
+        model = FlatForest.load(bundle_dir, mmap_mode=mmap_mode)
+    else:
+        model = joblib.load(os.path.join(bundle_dir, 'model.joblib'), mmap_mode=mmap_mode)
+    
+    vectorizer = joblib.load(os.path.join(bundle_dir, 'vectorizer.joblib'), mmap_mode=mmap_mode)
+    scaler = joblib.load(os.path.join(bundle_dir, 'scaler.joblib'), mmap_mode=mmap_mode)
+    
+    taxonomy = cv_matcher.text_processor.skill_taxonomy
+    if metadata.get('skill_taxonomy_fingerprint') != taxonomy.fingerprint:
+        logger.warning(
+            "Model bundle %s was trained with a different skill taxonomy; "
+            "skills features may not match", version
+        )
+    
+    cv_matcher.model = model
+    cv_matcher.scaler = scaler
+    cv_matcher.feature_extractor.set_vectorizer(vectorizer)
+    return metadata
@@ -0,0 +1,99 @@
+import threading
+import time
+
+# Pair used to exercise the whole scoring path once after loading
+WARMUP_RESUME = "Python developer with SQL, Docker and machine learning experience."
+WARMUP_JOB = "Looking for a Python developer familiar with SQL and Docker."
+
+class ModelNotFoundError(Exception):
+    """Raised when a model path holds no loadable model."""
+
+class ModelRegistry:
+    """Process-wide holder of the loaded CVMatcher.
+    
+    The model bundle is loaded once per process and shared by every
+    caller. Loading it in the master process before workers fork (e.g.
+    gunicorn --preload with WARMUP_ON_STARTUP) lets workers share it
+    copy-on-write on top of the memory-mapped bundle arrays.
+    """
+    
+    def __init__(self):
+        self._matcher = None
+        self._lock = threading.Lock()
+        # Serializes loads, so concurrent first requests load the bundle once
+        self._load_lock = threading.RLock()
+        self.ready = False
+        self.model_path = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.error = None
+    
+    def load(self, model_path, fast_tokenizer=None, warmup=True):
+        """Load a matcher, optionally warm it up, and make it current.
+        
+        The previous matcher keeps serving until the new one is ready.
+        Raises ModelNotFoundError if `model_path` holds no model.
+        """
+        from .cv_matcher import CVMatcher
+        
+        with self._load_lock:
+            started = time.perf_counter()
+            try:
+                matcher = CVMatcher(fast_tokenizer=fast_tokenizer)
+                if not matcher.load_model(model_path):
+                    raise ModelNotFoundError(f'No model found at {model_path}')
+                loaded = time.perf_counter()
+                
+                if warmup:
+                    matcher.predict_match(WARMUP_RESUME, WARMUP_JOB)
+            except Exception as e:
+                self.error = str(e)
+                self.ready = False
+                raise
+            
+            with self._lock:
+                self._matcher = matcher
+                self.model_path = model_path
+                self.loaded_at = time.time()
+                self.load_seconds = loaded - started
+                self.warmup_seconds = time.perf_counter() - loaded if warmup else None
+                self.error = None
+                self.ready = True
+            return matcher
+    
+    def get(self, model_path, fast_tokenizer=None):
+        """Get the current matcher, loading it on first use.
+        
+        Without a model the untrained matcher, which gives default scores,
+        is served; the registry then stays not ready with the error set.
+        """
+        matcher = self._matcher
+        if matcher is not None:
+            return matcher
+        
+        with self._load_lock:
+            if self._matcher is None:
+                try:
+                    self.load(model_path, fast_tokenizer=fast_tokenizer, warmup=False)
+                except ModelNotFoundError:
+                    from .cv_matcher import CVMatcher
+                    with self._lock:
+                        self._matcher = CVMatcher(fast_tokenizer=fast_tokenizer)
+                        self.model_path = model_path
+            return self._matcher
+    
+    def status(self):
+        """Describe the loaded model for readiness checks."""
+        matcher = self._matcher
+        return {
+            'ready': self.ready,
+            'model_path': self.model_path,
+            'model_version': matcher.model_version if matcher is not None else None,
+            'loaded_at': self.loaded_at,
+            'load_seconds': self.load_seconds,
+            'warmup_seconds': self.warmup_seconds,
+            'error': self.error
+        }
+
+registry = ModelRegistry()
@@ -2,7 +2,7 @@ import os
 import pandas as pd
 from app.ai.cv_matcher import CVMatcher
 
-def train_model(data_path, model_save_path):
+def train_model(data_path, model_save_path, workers=None, cache_path=None):
     """Train CV matcher model and save it."""
     # Check if data file exists
     if not os.path.exists(data_path):
@@ -15,7 +15,7 @@ def train_model(data_path, model_save_path):
     try:
         # Train model
         print("Training model...")
-        metrics = cv_matcher.train(data_path)
+        metrics = cv_matcher.train(data_path, workers=workers, cache_path=cache_path)
         
         # Print metrics
         print("\nModel Training Results:")
@@ -37,10 +37,12 @@ def train_model(data_path, model_save_path):
 if __name__ == "__main__":
     # Set paths
     data_path = os.path.join("data", "raw", "cv_job_dataset.csv")
-    model_path = os.path.join("data", "models", "cv_matcher_model.pkl")
+    model_path = os.path.join("data", "models", "cv_matcher")
+    cache_path = os.path.join("data", "processed", "cv_job_dataset.parquet")
+    workers = int(os.environ.get("PREPROCESS_WORKERS", 0)) or None
     
     # Train and save model
-    success = train_model(data_path, model_path)
+    success = train_model(data_path, model_path, workers=workers, cache_path=cache_path)
     
     if success:
         print("Model training completed successfully!")
@@ -0,0 +1,149 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+from .text_processor import TextProcessor
+
+# Columns of the training dataset that go through the text pipeline
+TEXT_COLUMNS = {
+    'Resume': ('processed_resume', 'resume_skills'),
+    'Job Description': ('processed_job', 'job_skills'),
+}
+
+# Bump when the text pipeline changes, so that cached datasets are rebuilt
+PREPROCESSING_VERSION = 1
+
+# Parquet schema metadata key holding the settings a cache was built with
+_CACHE_METADATA_KEY = b'cv_matcher.preprocessing'
+
+_worker_processor = None
+
+def _init_worker(fast_tokenizer, skill_taxonomy_path):
+    """Create one TextProcessor per worker process."""
+    global _worker_processor
+    _worker_processor = TextProcessor(
+        skill_taxonomy_path=skill_taxonomy_path, fast_tokenizer=fast_tokenizer
+    )
+
+def _run_pipeline(processor, texts):
+    return (
+        [processor.process_text(text) for text in texts],
+        [processor.extract_skills(text) for text in texts]
+    )
+
+def _process_texts(texts):
+    """Run the text pipeline on a batch of texts inside a worker."""
+    return _run_pipeline(_worker_processor, texts)
+
+def _batches(values, batch_size):
+    for start in range(0, len(values), batch_size):
+        yield values[start:start + batch_size]
+
+def create_executor(workers, processor):
+    """Create a process pool whose workers mirror `processor`'s settings."""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(processor.fast_tokenizer, processor.skill_taxonomy_path)
+    )
+
+def process_texts(texts, executor=None, batch_size=256, processor=None):
+    """Get processed texts and extracted skills for a list of texts.
+    
+    With an executor the texts are split into batches and processed by
+    the worker pool; without one they are processed in this process with
+    `processor`.
+    """
+    if executor is None:
+        results = [_run_pipeline(processor or TextProcessor(), texts)]
+    else:
+        results = executor.map(_process_texts, _batches(texts, batch_size))
+    
+    processed, skills = [], []
+    for batch_processed, batch_skills in results:
+        processed.extend(batch_processed)
+        skills.extend(batch_skills)
+    return processed, skills
+
+def preprocess_chunk(df, executor=None, batch_size=256, processor=None):
+    """Add processed text and skills columns to a dataframe chunk."""
+    for column, (processed_column, skills_column) in TEXT_COLUMNS.items():
+        processed, skills = process_texts(df[column].tolist(), executor, batch_size, processor)
+        df[processed_column] = processed
+        df[skills_column] = skills
+    
+    return df
+
+def preprocessing_fingerprint(processor):
+    """Identify the pipeline version and settings that produce processed texts."""
+    return json.dumps({
+        'version': PREPROCESSING_VERSION,
+        'fast_tokenizer': bool(processor.fast_tokenizer),
+        'skill_taxonomy': processor.skill_taxonomy.fingerprint or 'builtin'
+    }, sort_keys=True)
+
+def _read_cache(cache_path, data_path, fingerprint):
+    """Get the cached processed dataset, or None if it is missing or stale."""
+    import pyarrow.parquet as pq
+    
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(data_path):
+        return None
+    metadata = pq.read_schema(cache_path).metadata or {}
+    if metadata.get(_CACHE_METADATA_KEY) != fingerprint.encode():
+        return None
+    return pd.read_parquet(cache_path)
+
+def _write_cache(df, cache_path, fingerprint):
+    """Write the processed dataset with the fingerprint of its settings."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _CACHE_METADATA_KEY: fingerprint.encode()
+    })
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    tmp_path = f'{cache_path}.tmp'
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, cache_path)
+
+def preprocess_dataset(data_path, cache_path=None, workers=None, chunksize=5000,
+                       batch_size=256, processor=None):
+    """Preprocess a training CSV in chunks across a process pool.
+    
+    The CSV is streamed `chunksize` rows at a time and each chunk's texts
+    are fanned out to `workers` processes (all cores by default, 1 to
+    process inline). Workers use the same tokenizer and skill taxonomy
+    settings as `processor`. When `cache_path` is given the processed
+    dataset is written there as Parquet and reused as long as it is newer
+    than the CSV and was built with the same `preprocessing_fingerprint`.
+    """
+    processor = processor or TextProcessor()
+    fingerprint = preprocessing_fingerprint(processor)
+    if cache_path:
+        cached = _read_cache(cache_path, data_path, fingerprint)
+        if cached is not None:
+            return cached
+    
+    workers = workers or os.cpu_count() or 1
+    executor = None
+    if workers > 1:
+        executor = create_executor(workers, processor)
+    
+    try:
+        chunks = [
+            preprocess_chunk(chunk, executor, batch_size, processor)
+            for chunk in pd.read_csv(data_path, chunksize=chunksize)
+        ]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    
+    if cache_path:
+        _write_cache(df, cache_path, fingerprint)
+    
+    return df
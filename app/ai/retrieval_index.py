@@ -0,0 +1,112 @@
+import threading
+import numpy as np
+from scipy import sparse
+
+class SparseVectorIndex:
+    """Inverted index over L2-normalized sparse vectors for top-K cosine search.
+    
+    Vectors are kept as the rows of a CSC matrix, so each column is the
+    posting list of one term and a query only touches the posting lists
+    of its own non-zero terms. Inserts and updates go to a small pending
+    set that is merged into the matrix once it grows past
+    `compact_threshold`; deletions just mask the row until then.
+    """
+    
+    def __init__(self, n_features, compact_threshold=1024):
+        self.n_features = n_features
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._postings = sparse.csc_matrix((0, n_features), dtype=np.float32)
+        self._rows = {}  # id -> row of the postings matrix
+        self._pending = {}  # id -> CSR row not yet merged
+    
+    def __len__(self):
+        return len(self._rows) + len(self._pending)
+    
+    def __contains__(self, item_id):
+        return item_id in self._rows or item_id in self._pending
+    
+    @classmethod
+    def build(cls, ids, matrix, compact_threshold=1024):
+        """Build an index from ids and the matching rows of a sparse matrix."""
+        index = cls(matrix.shape[1], compact_threshold=compact_threshold)
+        index._set_matrix(np.asarray(ids, dtype=np.int64), sparse.csr_matrix(matrix, dtype=np.float32))
+        return index
+    
+    def _set_matrix(self, ids, matrix):
+        self._ids = ids
+        self._alive = np.ones(len(ids), dtype=bool)
+        self._postings = matrix.tocsc()
+        self._rows = {int(item_id): row for row, item_id in enumerate(ids)}
+    
+    def upsert(self, item_id, vector):
+        """Insert or replace the vector of an item."""
+        vector = sparse.csr_matrix(vector, dtype=np.float32)
+        with self._lock:
+            self._remove(item_id)
+            self._pending[item_id] = vector
+            if len(self._pending) >= self.compact_threshold:
+                self._compact()
+    
+    def remove(self, item_id):
+        """Remove an item; unknown ids are ignored."""
+        with self._lock:
+            self._remove(item_id)
+    
+    def _remove(self, item_id):
+        if self._pending.pop(item_id, None) is not None:
+            return
+        row = self._rows.pop(item_id, None)
+        if row is not None:
+            # Copy so that searches holding the previous mask are unaffected
+            alive = self._alive.copy()
+            alive[row] = False
+            self._alive = alive
+    
+    def compact(self):
+        """Merge pending vectors and drop removed rows."""
+        with self._lock:
+            self._compact()
+    
+    def _compact(self):
+        alive_rows = np.flatnonzero(self._alive)
+        blocks = [self._postings.tocsr()[alive_rows]]
+        ids = [self._ids[alive_rows]]
+        if self._pending:
+            blocks.append(sparse.vstack(list(self._pending.values()), format='csr'))
+            ids.append(np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending)))
+        self._set_matrix(np.concatenate(ids), sparse.vstack(blocks, format='csr'))
+        self._pending = {}
+    
+    def search(self, query, k, exclude=None):
+        """Get up to `k` (id, cosine similarity) pairs, best first.
+        
+        Only items sharing at least one term with the query are returned.
+        """
+        query = sparse.csr_matrix(query, dtype=np.float32)
+        with self._lock:
+            postings, ids, alive = self._postings, self._ids, self._alive
+            pending = list(self._pending.items())
+        
+        if query.nnz and postings.shape[0]:
+            scores = np.asarray(postings[:, query.indices] @ query.data).ravel()
+            scores[~alive] = 0
+        else:
+            scores = np.zeros(len(ids), dtype=np.float32)
+        
+        if pending:
+            pending_ids = np.array([item_id for item_id, _ in pending], dtype=np.int64)
+            pending_matrix = sparse.vstack([vector for _, vector in pending], format='csr')
+            ids = np.concatenate((ids, pending_ids))
+            scores = np.concatenate((scores, np.asarray(pending_matrix @ query.T.toarray()).ravel()))
+        
+        if exclude:
+            scores[np.isin(ids, np.fromiter(exclude, dtype=np.int64))] = 0
+        
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(ids[i]), float(scores[i])) for i in candidates]
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.json')
+
+# Marks the end of a skill phrase in the trie
+_END = None
+
+class SkillTaxonomy:
+    """Skills with synonyms compiled into a token trie.
+    
+    Every skill name and synonym is normalized into a sequence of tokens
+    and inserted into a trie, so all skills in a document are found in a
+    single pass over its tokens whatever the size of the taxonomy.
+    """
+    
+    def __init__(self, skills, normalize=None, fingerprint=None):
+        """Build the trie from (name, synonyms) pairs."""
+        normalize = normalize or (lambda phrase: phrase.lower())
+        self.skills = []
+        self.fingerprint = fingerprint
+        self.max_phrase_length = 0
+        self._trie = {}
+        
+        for name, synonyms in skills:
+            index = len(self.skills)
+            self.skills.append(name)
+            
+            for phrase in [name] + list(synonyms or []):
+                tokens = normalize(phrase).split()
+                if not tokens:
+                    continue
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(_END, set()).add(index)
+                self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+    
+    def __len__(self):
+        return len(self.skills)
+    
+    @classmethod
+    def load(cls, path, normalize=None):
+        """Load a taxonomy from a JSON file.
+        
+        The file holds {"skills": [{"name": ..., "synonyms": [...]}, ...]};
+        its SHA-256 is kept as the taxonomy fingerprint.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        entries = json.loads(data.decode('utf-8'))['skills']
+        return cls(
+            [(entry['name'], entry.get('synonyms', [])) for entry in entries],
+            normalize=normalize,
+            fingerprint=hashlib.sha256(data).hexdigest()
+        )
+    
+    def find(self, tokens):
+        """Find all skills in a token sequence.
+        
+        Returns canonical skill names in taxonomy order, each at most once.
+        """
+        found = set()
+        trie = self._trie
+        n_tokens = len(tokens)
+        
+        for start in range(n_tokens):
+            node = trie.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                if _END in node:
+                    found.update(node[_END])
+                if position >= n_tokens:
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        
+        return [self.skills[index] for index in sorted(found)]
+
+_taxonomies = {}
+_taxonomies_lock = threading.Lock()
+
+def get_taxonomy(path=None, normalize=None):
+    """Get the compiled taxonomy for a file, building it once per process."""
+    path = os.path.abspath(path or os.environ.get('SKILL_TAXONOMY_PATH') or DEFAULT_TAXONOMY_PATH)
+    with _taxonomies_lock:
+        if path not in _taxonomies:
+            _taxonomies[path] = SkillTaxonomy.load(path, normalize=normalize)
+        return _taxonomies[path]
@@ -1,28 +1,189 @@
+import os
 import re
 import string
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
+import threading
+from functools import lru_cache
 
-# Download necessary NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('wordnet')
+from .skill_taxonomy import get_taxonomy
+
+# NLTK data is read from this directory and never downloaded at runtime.
+# Populate it at build time with:
+#   python -m nltk.downloader -d data/nltk_data punkt stopwords wordnet
+NLTK_DATA_PATH = os.environ.get('NLTK_DATA_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'nltk_data'
+)
+
+NLTK_RESOURCES = ('tokenizers/punkt', 'corpora/stopwords', 'corpora/wordnet')
+
+_nltk_ready = False
+_nltk_lock = threading.Lock()
+
+def ensure_nltk_data():
+    """Import NLTK and resolve its data from the bundled local path.
+    
+    Raises LookupError naming the missing resources instead of trying to
+    download them.
+    """
+    global _nltk_ready
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        
+        import nltk
+        if NLTK_DATA_PATH not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA_PATH)
+        
+        missing = []
+        for resource in NLTK_RESOURCES:
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                missing.append(resource)
+        if missing:
+            raise LookupError(
+                f"Missing NLTK data {', '.join(missing)} in {NLTK_DATA_PATH}; "
+                f"run 'python -m nltk.downloader -d {NLTK_DATA_PATH} punkt stopwords wordnet'"
+            )
+        
+        _nltk_ready = True
+
+# Whitespace-separated runs that may hold a URL or an email address
+_SPECIAL_RUN_RE = re.compile(r'\S*(?:http|www|@)\S*')
+
+# Phone numbers are matched (and dropped) ahead of words in the same scan
+_FAST_TOKEN_RE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b|(\w+)')
+
+# Words that nltk.word_tokenize still splits once punctuation is removed
+_TOKENIZER_SPLITS = {
+    'cannot': ['can', 'not'],
+    'gimme': ['gim', 'me'],
+    'gonna': ['gon', 'na'],
+    'gotta': ['got', 'ta'],
+    'lemme': ['lem', 'me'],
+    'wanna': ['wan', 'na'],
+}
+
+def _clean_special_run(match):
+    """Drop URLs and email addresses from a run like `clean_text` does.
+    
+    `clean_text` removes URLs first, which cuts the run from the leftmost
+    'http'/'www' followed by at least one character, and then removes the
+    rest of the run if it still contains an email address.
+    """
+    run = match.group(0)
+    cut = len(run)
+    for marker in ('http', 'www'):
+        position = run.find(marker)
+        if position != -1 and position + len(marker) < len(run):
+            cut = min(cut, position)
+    
+    run = run[:cut]
+    if '@' in run[1:-1]:
+        return ''
+    return run
+
+def fast_clean_tokens(text):
+    """Clean text into tokens without NLTK.
+    
+    Equivalent to `TextProcessor.clean_text(text).split()`, but only runs
+    containing 'http', 'www' or '@' get special handling and phone number
+    removal and word splitting happen in one compiled scan.
+    """
+    if not isinstance(text, str):
+        return []
+    
+    text = text.lower()
+    if 'http' in text or 'www' in text or '@' in text:
+        text = _SPECIAL_RUN_RE.sub(_clean_special_run, text)
+    
+    return [token for token in _FAST_TOKEN_RE.findall(text) if token]
+
+def fast_tokenize(text):
+    """Clean and tokenize text, matching `clean_text` + `word_tokenize`."""
+    tokens = []
+    for token in fast_clean_tokens(text):
+        split = _TOKENIZER_SPLITS.get(token)
+        if split is None:
+            tokens.append(token)
+        else:
+            tokens.extend(split)
+    return tokens
+
+class TokenCache:
+    """Bounded, thread-safe memo of stopword filtering and lemmatization.
+    
+    Maps each token to its lemma, or to None for stop words. Resumes and
+    job descriptions reuse a small vocabulary, so after warm-up most
+    tokens are served from the cache instead of WordNet.
+    """
+    
+    def __init__(self, stop_words, lemmatizer, maxsize=100000):
+        self.stop_words = stop_words
+        self.lemmatizer = lemmatizer
+        self._normalize = lru_cache(maxsize=maxsize)(self._compute)
+    
+    def _compute(self, token):
+        if token in self.stop_words:
+            return None
+        return self.lemmatizer.lemmatize(token)
+    
+    def normalize(self, tokens):
+        """Drop stop words from tokens and lemmatize the rest."""
+        normalize = self._normalize
+        normalized = []
+        for token in tokens:
+            lemma = normalize(token)
+            if lemma is not None:
+                normalized.append(lemma)
+        return normalized
+    
+    def stats(self):
+        """Get hit/miss counters and current size of the cache."""
+        info = self._normalize.cache_info()
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'maxsize': info.maxsize
+        }
+    
+    def clear(self):
+        self._normalize.cache_clear()
+
+_shared_token_cache = None
+_shared_token_cache_lock = threading.Lock()
+
+def get_token_cache():
+    """Get the token cache shared by all TextProcessor instances."""
+    global _shared_token_cache
+    with _shared_token_cache_lock:
+        if _shared_token_cache is None:
+            ensure_nltk_data()
+            from nltk.corpus import stopwords
+            from nltk.stem import WordNetLemmatizer
+            _shared_token_cache = TokenCache(
+                set(stopwords.words('english')),
+                WordNetLemmatizer(),
+                maxsize=int(os.environ.get('TOKEN_CACHE_SIZE', 100000))
+            )
+        return _shared_token_cache
 
 class TextProcessor:
     """Text preprocessing utilities for resumes and job descriptions."""
     
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = WordNetLemmatizer()
+    def __init__(self, skill_taxonomy_path=None, token_cache=None, fast_tokenizer=None):
+        if fast_tokenizer is None:
+            fast_tokenizer = os.environ.get('FAST_TOKENIZER', 'false').lower() in ('1', 'true', 'yes')
+        self.fast_tokenizer = fast_tokenizer
+        self.token_cache = token_cache or get_token_cache()
+        self.stop_words = self.token_cache.stop_words
+        self.lemmatizer = self.token_cache.lemmatizer
+        self.skill_taxonomy_path = skill_taxonomy_path
+        self.skill_taxonomy = get_taxonomy(skill_taxonomy_path, normalize=TextProcessor.clean_text)
     
-    def clean_text(self, text):
+    @staticmethod
+    def clean_text(text):
         """Clean and normalize text."""
         if not isinstance(text, str):
             return ""
@@ -49,6 +210,7 @@ class TextProcessor:
     
     def tokenize(self, text):
         """Tokenize text into words."""
+        from nltk.tokenize import word_tokenize
         return word_tokenize(text)
     
     def remove_stopwords(self, tokens):
@@ -61,33 +223,22 @@ class TextProcessor:
     
     def process_text(self, text):
         """Apply full text processing pipeline."""
-        cleaned_text = self.clean_text(text)
-        tokens = self.tokenize(cleaned_text)
-        tokens = self.remove_stopwords(tokens)
-        tokens = self.lemmatize(tokens)
+        if self.fast_tokenizer:
+            tokens = fast_tokenize(text)
+        else:
+            cleaned_text = self.clean_text(text)
+            tokens = self.tokenize(cleaned_text)
+        tokens = self.token_cache.normalize(tokens)
         return ' '.join(tokens)
     
     def extract_skills(self, text):
-        """Extract skills from text."""
-        # In a real implementation, this would use a skills database or ML model
-        # For simplicity, we'll use a basic approach here
-        common_skills = [
-            'python', 'java', 'javascript', 'sql', 'machine learning',
-            'data analysis', 'project management', 'communication',
-            'leadership', 'teamwork', 'problem solving', 'aws', 'azure',
-            'cloud', 'devops', 'agile', 'scrum', 'react', 'angular', 'vue',
-            'django', 'flask', 'express', 'node', 'php', 'html', 'css',
-            'software development', 'database', 'docker', 'kubernetes',
-            'linux', 'windows', 'excel', 'powerpoint', 'word', 'writing',
-            'editing', 'marketing', 'sales', 'customer service', 'finance',
-            'accounting', 'hr', 'recruitment', 'negotiation', 'research'
-        ]
-        
-        found_skills = []
-        cleaned_text = self.clean_text(text)
-        
-        for skill in common_skills:
-            if re.search(r'\b' + re.escape(skill) + r'\b', cleaned_text):
-                found_skills.append(skill)
+        """Extract skills from text.
         
-        return found_skills
\ No newline at end of file
+        Skills and their synonyms come from the skill taxonomy file and are
+        matched in a single pass over the cleaned tokens.
+        """
+        if self.fast_tokenizer:
+            tokens = fast_clean_tokens(text)
+        else:
+            tokens = self.clean_text(text).split()
+        return self.skill_taxonomy.find(tokens)
\ No newline at end of file
@@ -0,0 +1,52 @@
+import sys
+import pandas as pd
+
+from .text_processor import TextProcessor
+
+# Inputs that exercise every cleaning rule and the tokenizer splits
+SAMPLE_CORPUS = [
+    "Senior Python Developer - 5+ years of Django/Flask, REST APIs & PostgreSQL.",
+    "Contact: john.doe@example.com | +1 555-123-4567 | https://github.com/johndoe",
+    "Portfolio at www.johndoe.dev; phone 555.123.4567 or 5551234567.",
+    "Worked on node.js, C++, C# and .NET; deployed with k8s (Kubernetes) on AWS.",
+    "I cannot stress enough: we're gonna ship, wanna learn, gotta deliver. Lemme know, gimme feedback.",
+    "Résumé: naïve café owner, 1,000,000 customers served, 24/7 support.",
+    "a@www.x.com foo@http://bar 5551234567http://x 123-5551234567 x-5551234567-y",
+    "Tabs\tand\nnewlines\r\nand   multiple    spaces",
+    "",
+]
+
+def compare_texts(texts, processor=None):
+    """Compare the fast and the NLTK pipelines on texts.
+    
+    Returns a list of (text, standard output, fast output) for every text
+    whose cleaned tokens, processed text or skills differ.
+    """
+    standard = processor or TextProcessor(fast_tokenizer=False)
+    fast = TextProcessor(fast_tokenizer=True, token_cache=standard.token_cache)
+    
+    mismatches = []
+    for text in texts:
+        expected = (standard.process_text(text), standard.extract_skills(text))
+        actual = (fast.process_text(text), fast.extract_skills(text))
+        if expected != actual:
+            mismatches.append((text, expected, actual))
+    return mismatches
+
+def main(paths):
+    """Check parity on the sample corpus and on text columns of CSV files."""
+    texts = list(SAMPLE_CORPUS)
+    for path in paths:
+        df = pd.read_csv(path)
+        for column in ('Resume', 'Job Description'):
+            if column in df:
+                texts.extend(df[column].dropna().astype(str))
+    
+    mismatches = compare_texts(texts)
+    for text, expected, actual in mismatches[:20]:
+        print(f"Mismatch for {text[:80]!r}:\n  nltk: {expected}\n  fast: {actual}")
+    print(f"{len(texts) - len(mismatches)}/{len(texts)} texts identical")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,253 @@
+import multiprocessing
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+def _run_ingestion_process(config_name, max_idle):
+    """Entry point of a spawned ingestion worker process."""
+    from . import create_app
+    from .services.ingestion_service import IngestionService
+    
+    IngestionService.run_worker(create_app(config_name), max_idle=max_idle)
+
+@click.command('ingest-worker')
+@click.option('--processes', type=int, default=None,
+              help='Worker processes to run (default: INGESTION_WORKERS).')
+@click.option('--drain', is_flag=True, help='Exit once the queue stays empty.')
+@with_appcontext
+def ingest_worker(processes, drain):
+    """Process queued resume uploads and scoring tasks with a pool of worker processes."""
+    from .services.ingestion_service import IngestionService
+    
+    app = current_app._get_current_object()
+    processes = processes or app.config['INGESTION_WORKERS']
+    max_idle = 5 * app.config['INGESTION_POLL_SECONDS'] if drain else None
+    
+    if processes <= 1:
+        IngestionService.run_worker(app, max_idle=max_idle)
+        return
+    
+    # Spawned workers build their own app, engine and model registry
+    context = multiprocessing.get_context('spawn')
+    workers = [
+        context.Process(target=_run_ingestion_process, args=(app.config['CONFIG_NAME'], max_idle))
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    click.echo(f'Started {processes} resume ingestion workers')
+    
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+@click.command('queue-scoring')
+@click.option('--candidates', is_flag=True, help='Also queue every candidate with a processed resume.')
+@with_appcontext
+def queue_scoring(candidates):
+    """Queue the rescoring of every active job, e.g. after a model change.
+    
+    Scores are computed by `flask ingest-worker`; pages only read them.
+    """
+    from .services.ingestion_service import IngestionService
+    
+    count = IngestionService.enqueue_all_scoring(candidates=candidates)
+    click.echo(f'Queued {count} scoring tasks')
+
+@click.command('prepare-features')
+@click.option('--batch-size', type=int, default=500, show_default=True)
+@with_appcontext
+def prepare_features(batch_size):
+    """Featurize active jobs and candidate resumes with the current extractor.
+    
+    The retrieval index only reads stored vectors, so run this before
+    serving traffic with a new model.
+    """
+    from .services.cv_matching_service import CVMatchingService
+    from .services.retrieval_service import RetrievalService
+    
+    cv_matcher = CVMatchingService().cv_matcher
+    jobs = RetrievalService.prepare_jobs(cv_matcher, batch_size=batch_size)
+    click.echo(f'Recomputed features of {jobs} jobs')
+    hashed, recomputed = RetrievalService.prepare_candidates(cv_matcher, batch_size=batch_size)
+    click.echo(f'Hashed {hashed} resumes, recomputed features of {recomputed} resumes')
+
+@click.command('import-resumes')
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--batch-size', type=int, default=500, show_default=True,
+              help='Resumes inserted per transaction.')
+@click.option('--workers', type=int, default=None,
+              help='Extraction and NLP processes (default: all cores).')
+@click.option('--email-domain', default='import.local', show_default=True,
+              help='Domain of the placeholder emails of imported candidates.')
+@with_appcontext
+def import_resumes(source, batch_size, workers, email_domain):
+    """Import a directory, zip or tar archive of resumes as candidates.
+    
+    Already imported files are skipped, so an interrupted import can be
+    run again with the same arguments.
+    """
+    from .services.cv_matching_service import CVMatchingService
+    from .services.import_service import ImportService
+    
+    def report(stats):
+        rate = stats['seen'] / stats['seconds'] if stats['seconds'] else 0
+        click.echo(
+            f"{stats['seen']} files: {stats['imported']} imported, {stats['skipped']} skipped, "
+            f"{stats['failed']} failed - {rate:.1f} files/s, "
+            f"{stats['bytes'] / 1024 / 1024 / max(stats['seconds'], 1e-9):.2f} MB/s"
+        )
+    
+    stats = ImportService.import_resumes(
+        source, CVMatchingService().cv_matcher, batch_size=batch_size,
+        workers=workers, email_domain=email_domain, report=report
+    )
+    report(stats)
+    click.echo(f"Done in {stats['seconds']:.1f}s")
+
+@click.command('import-jobs')
+@click.argument('feed', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+              help='Feed format (default: from the file extension).')
+@click.option('--creator', default=None, help='Username or email of the recruiter owning the jobs.')
+@click.option('--batch-size', type=int, default=1000, show_default=True,
+              help='Jobs upserted per transaction.')
+@click.option('--workers', type=int, default=None,
+              help='NLP processes for job features (default: all cores).')
+@click.option('--deactivate-missing', is_flag=True,
+              help="Deactivate the creator's feed jobs that are not in this feed.")
+@with_appcontext
+def import_jobs(feed, fmt, creator, batch_size, workers, deactivate_missing):
+    """Upsert job offers from a CSV or JSONL feed keyed by external_id."""
+    import os
+    from .ai.preprocessing import create_executor
+    from .models.user import User
+    from .services.cv_matching_service import CVMatchingService
+    from .services.job_feed_service import JobFeedService
+    
+    creator_id = None
+    if creator:
+        user = User.query.filter((User.username == creator) | (User.email == creator)).first()
+        if user is None or not user.is_recruiter():
+            raise click.BadParameter(f'No recruiter named {creator}', param_hint='--creator')
+        creator_id = user.id
+    
+    def report(stats):
+        rate = stats['seen'] / stats['seconds'] if stats['seconds'] else 0
+        click.echo(
+            f"{stats['seen']} records: {stats['created']} created, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, {stats['invalid']} invalid, "
+            f"{stats['features']} features computed - {rate:.0f} records/s"
+        )
+    
+    cv_matcher = CVMatchingService().cv_matcher
+    workers = workers or os.cpu_count() or 1
+    executor = create_executor(workers, cv_matcher.text_processor) if workers > 1 else None
+    try:
+        stats = JobFeedService.import_jobs(
+            feed, cv_matcher, creator_id=creator_id, fmt=fmt, batch_size=batch_size,
+            executor=executor, deactivate_missing=deactivate_missing, report=report
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    report(stats)
+    if deactivate_missing:
+        click.echo(f"{stats['deactivated']} jobs missing from the feed deactivated")
+    click.echo(f"Done in {stats['seconds']:.1f}s")
+
+@click.command('export-jobs')
+@click.argument('output', type=click.File('w', encoding='utf-8'))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default='csv', show_default=True)
+@click.option('--active-only', is_flag=True, help='Only export active jobs.')
+@with_appcontext
+def export_jobs(output, fmt, active_only):
+    """Stream job offers to a CSV or JSONL file ('-' for stdout)."""
+    from .services.job_feed_service import JobFeedService
+    
+    count = JobFeedService.export_jobs(output, fmt=fmt, active_only=active_only)
+    click.echo(f'Exported {count} jobs', err=True)
+
+@click.command('rebuild-job-stats')
+@with_appcontext
+def rebuild_job_stats():
+    """Recompute the per-job application counters from scratch."""
+    from .services.job_stats_service import JobStatsService
+    
+    count = JobStatsService.rebuild()
+    click.echo(f'Rebuilt application counters of {count} jobs')
+
+@click.command('rebuild-unread-counts')
+@with_appcontext
+def rebuild_unread_counts():
+    """Recompute every user's unread notification counter."""
+    from .services.notification_service import NotificationService
+    
+    count = NotificationService.rebuild_unread_counts()
+    click.echo(f'Rebuilt unread notification counters of {count} users')
+
+@click.command('check-query-plans')
+@click.option('--verbose', is_flag=True, help='Print the plan of every query.')
+@with_appcontext
+def check_query_plans(verbose):
+    """Fail if a hot query is not served by an index."""
+    import sys
+    from .services.query_plan_service import QueryPlanService
+    
+    failures = 0
+    for name, plan, problems in QueryPlanService.check():
+        click.echo(f"{'FAIL' if problems else 'ok  '} {name}")
+        for line in plan if verbose or problems else []:
+            click.echo(f'       {line}')
+        failures += bool(problems)
+    
+    if failures:
+        click.echo(f'{failures} queries are not served by an index', err=True)
+        sys.exit(1)
+
+@click.command('benchmark-db')
+@click.option('--profile', 'profiles', multiple=True,
+              help='Engine profile to compare (default: sqlite-default and sqlite-wal).')
+@click.option('--url', default=None,
+              help='Empty database to benchmark instead of a temporary SQLite file (one profile).')
+@click.option('--readers', type=int, default=8, show_default=True)
+@click.option('--writers', type=int, default=2, show_default=True)
+@click.option('--seconds', type=float, default=10.0, show_default=True)
+@click.option('--applications', type=int, default=20000, show_default=True,
+              help='Applications seeded before the run.')
+def benchmark_db(profiles, url, readers, writers, seconds, applications):
+    """Compare concurrent read/write throughput of engine profiles."""
+    from .database import benchmark, benchmark_sqlite_profiles
+    
+    options = {'readers': readers, 'writers': writers, 'seconds': seconds, 'applications': applications}
+    if url:
+        if len(profiles) != 1:
+            raise click.BadParameter('give exactly one profile with --url', param_hint='--profile')
+        results = [benchmark(url, profiles[0], **options)]
+    else:
+        results = benchmark_sqlite_profiles(profiles or ('sqlite-default', 'sqlite-wal'), **options)
+    
+    click.echo(f"{'profile':<16}{'reads/s':>10}{'writes/s':>10}{'read p95':>11}{'write p95':>11}{'errors':>8}")
+    for result in results:
+        p95 = ['-' if value is None else f'{value:.1f}ms' for value in (result['read_p95_ms'], result['write_p95_ms'])]
+        click.echo(
+            f"{result['profile']:<16}{result['reads_per_second']:>10.0f}{result['writes_per_second']:>10.0f}"
+            f"{p95[0]:>11}{p95[1]:>11}{result['read_errors'] + result['write_errors']:>8}"
+        )
+
+def register_commands(app):
+    """Register the application's CLI commands."""
+    app.cli.add_command(ingest_worker)
+    app.cli.add_command(queue_scoring)
+    app.cli.add_command(prepare_features)
+    app.cli.add_command(import_resumes)
+    app.cli.add_command(import_jobs)
+    app.cli.add_command(export_jobs)
+    app.cli.add_command(rebuild_job_stats)
+    app.cli.add_command(rebuild_unread_counts)
+    app.cli.add_command(check_query_plans)
+    app.cli.add_command(benchmark_db)
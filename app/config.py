@@ -1,14 +1,90 @@
 import os
 from datetime import timedelta
+from sqlalchemy.pool import QueuePool
+
+# Database engine profiles: SQLAlchemy engine options, plus SQLite
+# pragmas run on every new connection
+ENGINE_PROFILES = {
+    # SQLite as shipped: rollback journal, writers block readers
+    'sqlite-default': {
+        'engine_options': {},
+        'pragmas': {}
+    },
+    # Readers no longer wait for writers; writers wait for each other
+    # instead of failing with "database is locked"
+    'sqlite-wal': {
+        # Pooled, so pragmas run once per connection rather than per checkout
+        'engine_options': {
+            'poolclass': QueuePool,
+            'pool_size': int(os.environ.get('DATABASE_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DATABASE_MAX_OVERFLOW', 20)),
+            'connect_args': {'check_same_thread': False}
+        },
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 10000)),
+            'synchronous': 'NORMAL',  # a power loss may drop the last commits, never corrupts
+            'mmap_size': int(os.environ.get('SQLITE_MMAP_BYTES', 256 * 1024 * 1024))
+        }
+    },
+    'postgres': {
+        'engine_options': {
+            'pool_size': int(os.environ.get('DATABASE_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DATABASE_MAX_OVERFLOW', 20)),
+            'pool_timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', 30)),
+            'pool_pre_ping': True,
+            'pool_recycle': 1800,
+            'connect_args': {
+                'options': f"-c statement_timeout={int(os.environ.get('DATABASE_STATEMENT_TIMEOUT_MS', 30000))}"
+            }
+        },
+        'pragmas': {}
+    }
+}
+
+def default_engine_profile(database_uri):
+    """Pick the engine profile matching a database URI."""
+    if database_uri.startswith('postgres'):
+        return 'postgres'
+    return 'sqlite-wal' if database_uri.startswith('sqlite') and ':memory:' not in database_uri else 'sqlite-default'
 
 class Config:
     """Base configuration class."""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-please-change-in-production'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///cv_matcher.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # One of ENGINE_PROFILES; picked from the database URI when unset
+    DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE') or default_engine_profile(SQLALCHEMY_DATABASE_URI)
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'uploads', 'resumes')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
+    # Load the model and NLP data in create_app instead of on first use;
+    # with gunicorn --preload this happens once before workers fork
+    WARMUP_ON_STARTUP = os.environ.get('WARMUP_ON_STARTUP', 'false').lower() in ('1', 'true', 'yes')
+    # Clean and tokenize text without NLTK, with identical output
+    FAST_TOKENIZER = os.environ.get('FAST_TOKENIZER', 'false').lower() in ('1', 'true', 'yes')
+    # Model bundle directory (or a legacy pickle of the classifier)
+    MODEL_PATH = os.environ.get('MODEL_PATH') or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'models', 'cv_matcher')
+    RESUME_FEATURE_CACHE_SIZE = int(os.environ.get('RESUME_FEATURE_CACHE_SIZE', 256))  # in-memory LRU entries
+    # Jobs retrieved by TF-IDF similarity and reranked by the classifier
+    RETRIEVAL_TOP_K = int(os.environ.get('RETRIEVAL_TOP_K', 50))
+    RETRIEVAL_REFRESH_SECONDS = int(os.environ.get('RETRIEVAL_REFRESH_SECONDS', 30))  # pick up other workers' job changes
+    # Uploaded resumes are processed by `flask ingest-worker`; set
+    # INGESTION_THREADS to also run worker threads inside the web process
+    INGESTION_WORKERS = int(os.environ.get('INGESTION_WORKERS', os.cpu_count() or 1))
+    INGESTION_THREADS = int(os.environ.get('INGESTION_THREADS', 0))
+    INGESTION_POLL_SECONDS = float(os.environ.get('INGESTION_POLL_SECONDS', 1.0))
+    INGESTION_TIMEOUT_SECONDS = int(os.environ.get('INGESTION_TIMEOUT_SECONDS', 600))  # reclaim rows of dead workers
+    INGESTION_MAX_ATTEMPTS = int(os.environ.get('INGESTION_MAX_ATTEMPTS', 3))
+    # Resume parsing runs in a separate process pool with these limits
+    EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', 2))
+    EXTRACTION_TIMEOUT_SECONDS = int(os.environ.get('EXTRACTION_TIMEOUT_SECONDS', 20))
+    EXTRACTION_MAX_PAGES = int(os.environ.get('EXTRACTION_MAX_PAGES', 30))
+    EXTRACTION_MEMORY_MB = int(os.environ.get('EXTRACTION_MEMORY_MB', 512))
+    EXTRACTION_RETRY_SECONDS = int(os.environ.get('EXTRACTION_RETRY_SECONDS', 3600))  # before a failed file is read again
+    APPLICATIONS_PER_PAGE = int(os.environ.get('APPLICATIONS_PER_PAGE', 25))
+    NOTIFICATIONS_PER_PAGE = int(os.environ.get('NOTIFICATIONS_PER_PAGE', 20))
+    JOBS_PER_PAGE = int(os.environ.get('JOBS_PER_PAGE', 20))
     
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -18,6 +94,7 @@ class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    DATABASE_PROFILE = 'sqlite-default'
     
 class ProductionConfig(Config):
     """Production configuration."""
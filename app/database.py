@@ -0,0 +1,160 @@
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.exc import OperationalError
+from .config import ENGINE_PROFILES
+
+def engine_options(profile, overrides=None):
+    """Get the SQLAlchemy engine options of a profile, with overrides applied."""
+    options = dict(ENGINE_PROFILES[profile]['engine_options'])
+    options.update(overrides or {})
+    return options
+
+def set_pragmas(engine, pragmas):
+    """Run SQLite pragmas on every new connection of an engine."""
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+def init_database(app, db):
+    """Set up the app's engine from its DATABASE_PROFILE.
+    
+    Engine options from SQLALCHEMY_ENGINE_OPTIONS take precedence over
+    the profile's. Pragmas are registered before the first connection is
+    opened, so every pooled connection gets them.
+    """
+    profile = app.config['DATABASE_PROFILE']
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+        profile, app.config.get('SQLALCHEMY_ENGINE_OPTIONS')
+    )
+    db.init_app(app)
+    
+    with app.app_context():
+        set_pragmas(db.engine, ENGINE_PROFILES[profile]['pragmas'])
+
+def create_profile_engine(url, profile):
+    """Create a standalone engine configured like an app using `profile`."""
+    engine = create_engine(url, **engine_options(profile))
+    set_pragmas(engine, ENGINE_PROFILES[profile]['pragmas'])
+    return engine
+
+def _seed(engine, jobs, applications):
+    from .extensions import db
+    from .models.application import Application
+    from .models.job import JobOffer
+    from .models.user import User
+    
+    db.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert(), [
+            {'id': i + 1, 'username': f'bench{i}', 'email': f'bench{i}@bench.local', 'role': 'candidate'}
+            for i in range(applications // jobs)
+        ])
+        connection.execute(JobOffer.__table__.insert(), [
+            {'id': i + 1, 'title': f'Job {i}', 'description': 'Benchmark job', 'is_active': True, 'created_at': now}
+            for i in range(jobs)
+        ])
+        connection.execute(Application.__table__.insert(), [
+            {'job_id': i % jobs + 1, 'applicant_id': i // jobs + 1, 'match_percentage': random.uniform(0, 100),
+             'status': 'pending', 'created_at': now}
+            for i in range(applications)
+        ])
+
+def benchmark(url, profile, readers=8, writers=2, seconds=10.0, jobs=50, applications=20000, seed=True):
+    """Measure read and write throughput of concurrent threads on one profile.
+    
+    Readers fetch pages of a job's applications by score; writers change
+    an application's status and notify its candidate in one transaction.
+    With `seed`, the schema is created and filled first, so `url` should
+    point to an empty database. Returns a dict of throughput, p95
+    latencies and the number of operations that failed with a lock or
+    timeout error.
+    """
+    from .models.application import Application
+    from .models.notification import Notification
+    
+    engine = create_profile_engine(url, profile)
+    if seed:
+        _seed(engine, jobs, applications)
+    
+    applications_table = Application.__table__
+    notifications = Notification.__table__
+    page = select(applications_table).order_by(
+        applications_table.c.match_percentage.desc(), applications_table.c.id.desc()
+    ).limit(25)
+    
+    latencies = {'read': [], 'write': []}
+    errors = {'read': 0, 'write': 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+    
+    def read(connection):
+        connection.execute(page.where(applications_table.c.job_id == random.randint(1, jobs))).fetchall()
+    
+    def write(connection):
+        with connection.begin():
+            application_id = random.randint(1, applications)
+            connection.execute(applications_table.update().where(
+                applications_table.c.id == application_id
+            ).values(status=random.choice(['pending', 'reviewing', 'shortlisted']), updated_at=datetime.utcnow()))
+            connection.execute(notifications.insert().values(
+                user_id=random.randint(1, applications // jobs), message='Benchmark status change',
+                is_read=False, created_at=datetime.utcnow()
+            ))
+    
+    def run(kind, operation):
+        done, failed = [], 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    operation(connection)
+                done.append(time.perf_counter() - started)
+            except OperationalError:
+                failed += 1
+        with lock:
+            latencies[kind].extend(done)
+            errors[kind] += failed
+    
+    threads = [threading.Thread(target=run, args=('read', read)) for _ in range(readers)]
+    threads += [threading.Thread(target=run, args=('write', write)) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    
+    def p95(values):
+        return sorted(values)[int(len(values) * 0.95)] * 1000 if values else None
+    
+    return {
+        'profile': profile,
+        'reads_per_second': len(latencies['read']) / seconds,
+        'writes_per_second': len(latencies['write']) / seconds,
+        'read_p95_ms': p95(latencies['read']),
+        'write_p95_ms': p95(latencies['write']),
+        'read_errors': errors['read'],
+        'write_errors': errors['write']
+    }
+
+def benchmark_sqlite_profiles(profiles, **kwargs):
+    """Benchmark SQLite profiles, each on its own fresh temporary database."""
+    results = []
+    for profile in profiles:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'benchmark.db')
+            results.append(benchmark(f'sqlite:///{path}', profile, **kwargs))
+    return results
@@ -1,4 +1,10 @@
 from .user import User
 from .job import JobOffer
 from .application import Application
-from .notification import Notification
\ No newline at end of file
+from .notification import Notification
+from .job_features import JobFeatures
+from .resume_features import ResumeFeatures
+from .match_score import MatchScore
+from .resume_ingestion import ResumeIngestion
+from .job_stats import JobApplicationStats
+from .scoring_task import ScoringTask
\ No newline at end of file
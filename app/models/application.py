@@ -4,6 +4,12 @@ from .. import db
 class Application(db.Model):
     """Job application model for candidates applying to jobs."""
     __tablename__ = 'applications'
+    __table_args__ = (
+        # Keyset pagination of a job's applications by score
+        db.Index('ix_applications_job_id_match_percentage_id', 'job_id', 'match_percentage', 'id'),
+        # A candidate applies once per job; also serves lookups by applicant
+        db.Index('ix_applications_applicant_id_job_id', 'applicant_id', 'job_id', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job_offers.id'))
@@ -11,8 +17,10 @@ class Application(db.Model):
     resume_path = db.Column(db.String(255))
     resume_text = db.Column(db.Text)
     cover_letter = db.Column(db.Text)
-    match_percentage = db.Column(db.Float, default=0.0)
-    status = db.Column(db.String(20), default='pending')  # 'pending', 'reviewed', 'accepted', 'rejected'
+    # Old values are kept on change for the job application counters;
+    # NULL until the applicant's resume has been scored
+    match_percentage = db.column_property(db.Column(db.Float), active_history=True)
+    status = db.column_property(db.Column(db.String(20), default='pending'), active_history=True)  # 'pending', 'reviewed', 'accepted', 'rejected'
     recruiter_notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
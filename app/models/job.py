@@ -1,11 +1,18 @@
+import hashlib
 from datetime import datetime
 from .. import db
 
 class JobOffer(db.Model):
     """Job offer model for recruiters to post jobs."""
     __tablename__ = 'job_offers'
+    __table_args__ = (
+        # Active job listings and recruiter dashboards, newest first
+        db.Index('ix_job_offers_is_active_created_at', 'is_active', 'created_at'),
+        db.Index('ix_job_offers_creator_id_created_at', 'creator_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
+    external_id = db.Column(db.String(100), unique=True, index=True)  # id in the ATS job feed
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
     requirements = db.Column(db.Text)
@@ -19,14 +26,24 @@ class JobOffer(db.Model):
     
     # Relationships
     applications = db.relationship('Application', backref='job', lazy='dynamic')
+    features = db.relationship('JobFeatures', backref='job', uselist=False)
     
     def __repr__(self):
         return f'<JobOffer {self.title}>'
     
+    def content_hash(self):
+        """Hash of the text used for matching, to detect changes."""
+        digest = hashlib.sha256()
+        digest.update((self.description or '').encode('utf-8'))
+        digest.update(b'\0')
+        digest.update((self.requirements or '').encode('utf-8'))
+        return digest.hexdigest()
+    
     def to_dict(self):
         """Convert job offer to dictionary."""
         return {
             'id': self.id,
+            'external_id': self.external_id,
             'title': self.title,
             'description': self.description,
             'requirements': self.requirements,
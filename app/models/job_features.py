@@ -0,0 +1,20 @@
+from datetime import datetime
+from .. import db
+
+class JobFeatures(db.Model):
+    """Precomputed matching features for a job offer."""
+    __tablename__ = 'job_features'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_offers.id'), unique=True, index=True)
+    processed_text = db.Column(db.Text)
+    skills = db.Column(db.Text)  # JSON encoded list of skills
+    tfidf_indices = db.Column(db.LargeBinary)  # int32 column indices of the sparse TF-IDF row
+    tfidf_values = db.Column(db.LargeBinary)  # float64 values of the sparse TF-IDF row
+    tfidf_size = db.Column(db.Integer)
+    content_hash = db.Column(db.String(64))
+    extractor_version = db.Column(db.String(64))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<JobFeatures {self.job_id}>'
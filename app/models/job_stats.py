@@ -0,0 +1,109 @@
+from datetime import datetime
+from sqlalchemy import case, event, func, select
+from .. import db
+from .application import Application
+from .job import JobOffer
+
+# Application statuses with their own counter column
+COUNTED_STATUSES = ('pending', 'reviewing', 'shortlisted', 'interview', 'offered', 'accepted', 'rejected')
+
+class JobApplicationStats(db.Model):
+    """Denormalized application counters of a job offer.
+    
+    Kept up to date in the same transaction as application inserts,
+    status changes and deletes by the mapper events below; rebuild with
+    `flask rebuild-job-stats`.
+    """
+    __tablename__ = 'job_application_stats'
+    
+    job_id = db.Column(db.Integer, db.ForeignKey('job_offers.id'), primary_key=True)
+    applications_count = db.Column(db.Integer, nullable=False, default=0)
+    pending_count = db.Column(db.Integer, nullable=False, default=0)
+    reviewing_count = db.Column(db.Integer, nullable=False, default=0)
+    shortlisted_count = db.Column(db.Integer, nullable=False, default=0)
+    interview_count = db.Column(db.Integer, nullable=False, default=0)
+    offered_count = db.Column(db.Integer, nullable=False, default=0)
+    accepted_count = db.Column(db.Integer, nullable=False, default=0)
+    rejected_count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0.0)
+    scored_count = db.Column(db.Integer, nullable=False, default=0)
+    max_score = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @property
+    def average_score(self):
+        return self.score_sum / self.scored_count if self.scored_count else None
+    
+    def status_counts(self):
+        """Get the number of applications per counted status."""
+        return {status: getattr(self, f'{status}_count') for status in COUNTED_STATUSES}
+    
+    def __repr__(self):
+        return f'<JobApplicationStats {self.job_id}: {self.applications_count}>'
+
+def _status_column(status):
+    status = (status or '').lower()
+    return f'{status}_count' if status in COUNTED_STATUSES else None
+
+def _apply_delta(connection, job_id, sign, status=None, score=None):
+    """Add or remove one application's contribution to its job's counters."""
+    if job_id is None:
+        return
+    
+    table = JobApplicationStats.__table__
+    values = {'applications_count': table.c.applications_count + sign, 'updated_at': datetime.utcnow()}
+    column = _status_column(status)
+    if column:
+        values[column] = table.c[column] + sign
+    if score is not None:
+        values['score_sum'] = table.c.score_sum + sign * score
+        values['scored_count'] = table.c.scored_count + sign
+        if sign > 0:
+            values['max_score'] = case(
+                (table.c.max_score.is_(None), score),
+                (table.c.max_score < score, score),
+                else_=table.c.max_score
+            )
+        else:
+            # The maximum cannot be decremented, so it is recomputed
+            values['max_score'] = _max_score_query(job_id)
+    
+    result = connection.execute(table.update().where(table.c.job_id == job_id).values(**values))
+    if result.rowcount == 0:
+        # Jobs created before the stats table existed get their row lazily
+        connection.execute(table.insert().values(job_id=job_id))
+        connection.execute(table.update().where(table.c.job_id == job_id).values(**values))
+
+def _max_score_query(job_id):
+    applications = Application.__table__
+    return select(func.max(applications.c.match_percentage)).where(
+        applications.c.job_id == job_id
+    ).scalar_subquery()
+
+@event.listens_for(JobOffer, 'after_insert')
+def _create_job_stats(mapper, connection, job):
+    connection.execute(JobApplicationStats.__table__.insert().values(job_id=job.id))
+
+@event.listens_for(Application, 'after_insert')
+def _count_new_application(mapper, connection, application):
+    _apply_delta(connection, application.job_id, 1, application.status, application.match_percentage)
+
+@event.listens_for(Application, 'after_delete')
+def _uncount_deleted_application(mapper, connection, application):
+    _apply_delta(connection, application.job_id, -1, application.status, application.match_percentage)
+
+@event.listens_for(Application, 'after_update')
+def _recount_updated_application(mapper, connection, application):
+    state = db.inspect(application)
+    status = state.attrs.status.history
+    score = state.attrs.match_percentage.history
+    if not status.has_changes() and not score.has_changes():
+        return
+    
+    old_status = status.deleted[0] if status.deleted else application.status
+    old_score = new_score = None
+    if score.has_changes():
+        old_score = score.deleted[0] if score.deleted else None
+        new_score = application.match_percentage
+    _apply_delta(connection, application.job_id, -1, old_status, old_score)
+    _apply_delta(connection, application.job_id, 1, application.status, new_score)
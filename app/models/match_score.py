@@ -0,0 +1,24 @@
+from datetime import datetime
+from .. import db
+
+class MatchScore(db.Model):
+    """Materialized match score between a candidate's resume and a job offer."""
+    __tablename__ = 'match_scores'
+    __table_args__ = (
+        db.UniqueConstraint('candidate_id', 'job_id', name='uq_match_scores_candidate_job'),
+        # Best stored matches of a job or of a candidate
+        db.Index('ix_match_scores_job_id_score', 'job_id', 'score'),
+        db.Index('ix_match_scores_candidate_id_score', 'candidate_id', 'score'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_offers.id'), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)  # match percentage, 0-100
+    model_version = db.Column(db.String(64), nullable=False)
+    resume_hash = db.Column(db.String(64))
+    job_hash = db.Column(db.String(64))
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<MatchScore {self.candidate_id}-{self.job_id}: {self.score:.1f}>'
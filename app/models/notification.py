@@ -4,6 +4,11 @@ from .. import db
 class Notification(db.Model):
     """Notification model for system notifications."""
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # Unread badge and newest-first feed of a user
+        db.Index('ix_notifications_user_id_is_read_created_at', 'user_id', 'is_read', 'created_at'),
+        db.Index('ix_notifications_user_id_created_at', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -0,0 +1,22 @@
+from datetime import datetime
+from .. import db
+
+class ResumeFeatures(db.Model):
+    """Cached extraction and matching features for an uploaded resume file."""
+    __tablename__ = 'resume_features'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    file_hash = db.Column(db.String(64), unique=True, index=True)  # SHA-256 of the uploaded bytes
+    extracted_text = db.Column(db.Text)
+    processed_text = db.Column(db.Text)
+    skills = db.Column(db.Text)  # JSON encoded list of skills
+    tfidf_indices = db.Column(db.LargeBinary)  # int32 column indices of the sparse TF-IDF row
+    tfidf_values = db.Column(db.LargeBinary)  # float64 values of the sparse TF-IDF row
+    tfidf_size = db.Column(db.Integer)
+    extractor_version = db.Column(db.String(64))
+    extraction_error = db.Column(db.Text)  # set while the file cannot be extracted
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ResumeFeatures {self.file_hash[:12] if self.file_hash else None}>'
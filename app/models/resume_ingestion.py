@@ -0,0 +1,23 @@
+from datetime import datetime
+from .. import db
+
+class ResumeIngestion(db.Model):
+    """Queued background processing of an uploaded resume."""
+    __tablename__ = 'resume_ingestions'
+    __table_args__ = (
+        db.Index('ix_resume_ingestions_status_id', 'status', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    file_path = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, processing, done, failed, superseded
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    worker_id = db.Column(db.String(64))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<ResumeIngestion {self.id} {self.status}>'
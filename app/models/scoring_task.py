@@ -0,0 +1,24 @@
+from datetime import datetime
+from .. import db
+
+class ScoringTask(db.Model):
+    """Queued background rescoring of a job offer or of a candidate."""
+    __tablename__ = 'scoring_tasks'
+    __table_args__ = (
+        db.Index('ix_scoring_tasks_status_id', 'status', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_offers.id'), index=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, processing, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    worker_id = db.Column(db.String(64))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        target = f'job {self.job_id}' if self.job_id is not None else f'candidate {self.candidate_id}'
+        return f'<ScoringTask {self.id} {target} {self.status}>'
@@ -15,6 +15,10 @@ class User(UserMixin, db.Model):
     role = db.Column(db.String(20))  # 'recruiter' or 'candidate'
     first_name = db.Column(db.String(64))
     last_name = db.Column(db.String(64))
+    resume_path = db.Column(db.String(255))
+    resume_hash = db.Column(db.String(64), index=True)  # SHA-256 of the processed resume file
+    # Maintained by NotificationService, so page headers need no COUNT query
+    unread_notifications = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
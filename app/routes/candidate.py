@@ -1,7 +1,9 @@
 from flask import Blueprint, render_template, redirect, request, url_for, flash, current_app
 from flask_login import login_required, current_user
+from sqlalchemy.exc import IntegrityError
 from werkzeug.utils import secure_filename
 from ..services.cv_matching_service import CVMatchingService
+from ..services.ingestion_service import IngestionService
 from ..models.job import JobOffer
 from ..models.application import Application
 import os
@@ -18,7 +20,12 @@ def dashboard():
         return redirect(url_for('common.index'))
 
     applications = current_user.applications
-    return render_template('candidate/dashboard.html', applications=applications)
+    resume_ingestion = IngestionService.get_status(current_user.id)
+    return render_template(
+        'candidate/dashboard.html',
+        applications=applications,
+        resume_ingestion=resume_ingestion
+    )
 
 @candidate_bp.route('/job-listings')
 @login_required
@@ -27,23 +34,34 @@ def job_listings():
         flash('Access denied. Candidate role required.', 'danger')
         return redirect(url_for('common.index'))
 
-    jobs = JobOffer.query.filter_by(is_active=True).all()
-
     resume_file = None
     if current_user.resume_path:
         resume_file = os.path.basename(current_user.resume_path)
 
-    job_matches = {}
-    if current_user.resume_path:
-        for job in jobs:
-            score = CVMatchingService.get_matching_score(current_user.id, job.id)
-            job_matches[job.id] = score
+    # Best matches on the first page, then a paginated tail of recent jobs
+    before = request.args.get('before')
+    top_jobs = []
+    resume_ingestion = None
+    if current_user.resume_path and not current_user.resume_hash:
+        # Matches are shown once the ingestion workers processed the resume
+        resume_ingestion = IngestionService.get_status(current_user.id)
+    elif current_user.resume_path:
+        top_jobs = CVMatchingService.get_top_jobs(current_user.id)
+    job_matches = {job.id: score for job, score in top_jobs}
+    jobs, next_cursor = CVMatchingService.get_recent_jobs(
+        exclude_ids=job_matches, before=before,
+        limit=current_app.config['JOBS_PER_PAGE']
+    )
+    if not before:
+        jobs = [job for job, _ in top_jobs] + jobs
 
     return render_template(
         'candidate/job_listings.html',
         jobs=jobs,
         job_matches=job_matches,
-        resume_file=resume_file
+        next_cursor=next_cursor,
+        resume_file=resume_file,
+        resume_ingestion=resume_ingestion
     )
 
 @candidate_bp.route('/upload-resume', methods=['GET', 'POST'])
@@ -69,12 +87,15 @@ def upload_resume():
             file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
             file.save(file_path)
             current_user.resume_path = file_path
+            # Not matched against the previous resume's features any more
+            current_user.resume_hash = None
 
             try:
                 from .. import db
+                # Extraction and scoring run in the ingestion workers
+                IngestionService.enqueue(current_user.id, file_path, commit=False)
                 db.session.commit()
-                flash('Resume uploaded successfully', 'success')
-                CVMatchingService.process_resume(current_user.id, file_path)
+                flash('Resume uploaded successfully, it is being analysed', 'success')
                 return redirect(url_for('candidate.dashboard'))
             except Exception as e:
                 from .. import db
@@ -93,7 +114,7 @@ def apply_job(job_id):
     job = JobOffer.query.get_or_404(job_id)
 
     existing_application = Application.query.filter_by(
-        candidate_id=current_user.id,
+        applicant_id=current_user.id,
         job_id=job_id
     ).first()
 
@@ -107,19 +128,31 @@ def apply_job(job_id):
 
     if request.method == 'POST':
         cover_letter = request.form.get('cover_letter', '')
+        match_percentage = CVMatchingService.get_matching_score(current_user.id, job_id)
         application = Application(
-            candidate_id=current_user.id,
+            applicant_id=current_user.id,
             job_id=job_id,
+            resume_path=current_user.resume_path,
             cover_letter=cover_letter,
+            match_percentage=match_percentage,
             status='PENDING'
         )
 
         try:
             from .. import db
             db.session.add(application)
+            if match_percentage is None and current_user.resume_hash:
+                # Scored by the ingestion workers; queued resumes are scored once processed
+                IngestionService.enqueue_scoring(job_id=job_id, commit=False)
             db.session.commit()
             flash('Application submitted successfully', 'success')
             return redirect(url_for('candidate.dashboard'))
+        except IntegrityError:
+            # A concurrent request inserted the same application first
+            from .. import db
+            db.session.rollback()
+            flash('You have already applied for this job', 'warning')
+            return redirect(url_for('candidate.job_listings'))
         except Exception as e:
             from .. import db
             db.session.rollback()
@@ -140,5 +173,5 @@ def view_applications():
         flash('Access denied. Candidate role required.', 'danger')
         return redirect(url_for('common.index'))
 
-    applications = Application.query.filter_by(candidate_id=current_user.id).all()
+    applications = Application.query.filter_by(applicant_id=current_user.id).all()
     return render_template('candidate/applications.html', applications=applications)
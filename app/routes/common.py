@@ -1,6 +1,7 @@
-from flask import Blueprint, render_template, redirect, url_for, flash
+from flask import Blueprint, render_template, redirect, request, url_for, flash, jsonify, current_app
 from flask_login import current_user, login_required
 from ..models.notification import Notification
+from ..services.notification_service import NotificationService
 
 common_bp = Blueprint('common', __name__)
 
@@ -17,38 +18,46 @@ def index():
 @login_required
 def notifications():
     """User notifications route."""
-    # Get user notifications
-    notifications = Notification.query.filter_by(
-        user_id=current_user.id
-    ).order_by(Notification.created_at.desc()).all()
+    # One page of the user's notifications, newest first
+    notifications, next_cursor = NotificationService.get_feed(
+        current_user.id,
+        unread_only=request.args.get('unread', type=int) == 1,
+        before=request.args.get('before'),
+        limit=current_app.config['NOTIFICATIONS_PER_PAGE']
+    )
     
     return render_template(
         'common/notifications.html',
-        notifications=notifications
+        notifications=notifications,
+        next_cursor=next_cursor
     )
 
+@common_bp.route('/notifications/feed')
+@login_required
+def notification_feed():
+    """Paginated notification feed as JSON."""
+    limit = request.args.get('limit', current_app.config['NOTIFICATIONS_PER_PAGE'], type=int)
+    notifications, next_cursor = NotificationService.get_feed(
+        current_user.id,
+        unread_only=request.args.get('unread', type=int) == 1,
+        before=request.args.get('before'),
+        limit=max(1, min(limit, 100))
+    )
+    
+    return jsonify({
+        'notifications': [notification.to_dict() for notification in notifications],
+        'next_cursor': next_cursor,
+        'unread_count': current_user.unread_notifications
+    })
+
 @common_bp.route('/notifications/mark-read/<int:notification_id>', methods=['POST'])
 @login_required
 def mark_notification_read(notification_id):
     """Mark notification as read."""
-    # Get notification
-    notification = Notification.query.get_or_404(notification_id)
-    
-    # Ensure notification belongs to user
-    if notification.user_id != current_user.id:
-        flash('Access denied.', 'danger')
-        return redirect(url_for('common.notifications'))
-    
-    # Mark as read
-    notification.is_read = True
-    
-    try:
-        from .. import db
-        db.session.commit()
-    except Exception as e:
-        from .. import db
-        db.session.rollback()
-        flash(f'Error marking notification as read: {str(e)}', 'danger')
+    # Only matches the notification if it belongs to the user
+    success, message = NotificationService.mark_as_read(current_user.id, [notification_id])
+    if not success:
+        flash(message, 'danger')
     
     return redirect(url_for('common.notifications'))
 
@@ -56,27 +65,22 @@ def mark_notification_read(notification_id):
 @login_required
 def mark_all_notifications_read():
     """Mark all notifications as read."""
-    try:
-        from .. import db
-        # Get all unread notifications for user
-        notifications = Notification.query.filter_by(
-            user_id=current_user.id,
-            is_read=False
-        ).all()
-        
-        # Mark all as read
-        for notification in notifications:
-            notification.is_read = True
-        
-        db.session.commit()
+    success, message = NotificationService.mark_all_as_read(current_user.id)
+    if success:
         flash('All notifications marked as read', 'success')
-    except Exception as e:
-        from .. import db
-        db.session.rollback()
-        flash(f'Error marking notifications as read: {str(e)}', 'danger')
+    else:
+        flash(message, 'danger')
     
     return redirect(url_for('common.notifications'))
 
+@common_bp.route('/ready')
+def ready():
+    """Readiness probe: 200 once the scoring model is loaded and warmed up."""
+    from ..services.cv_matching_service import CVMatchingService
+    
+    status = CVMatchingService.readiness()
+    return jsonify(status), 200 if status['ready'] else 503
+
 @common_bp.route('/about')
 def about():
     """About page route."""
@@ -1,11 +1,15 @@
-from flask import Blueprint, render_template, redirect, request, url_for, flash
+from flask import Blueprint, render_template, redirect, request, url_for, flash, current_app
 from flask_login import login_required, current_user
 from ..models.job import JobOffer
 from ..models.application import Application
 from ..services.cv_matching_service import CVMatchingService
+from ..services.ingestion_service import IngestionService
+from ..services.job_stats_service import JobStatsService
 
 recruiter_bp = Blueprint('recruiter', __name__)
 
+APPLICATION_STATUSES = ['PENDING', 'REVIEWING', 'REJECTED', 'SHORTLISTED', 'INTERVIEW', 'OFFERED', 'ACCEPTED']
+
 @recruiter_bp.route('/dashboard')
 @login_required
 def dashboard():
@@ -14,21 +18,17 @@ def dashboard():
         flash('Access denied. Recruiter role required.', 'danger')
         return redirect(url_for('common.index'))
     
-    # Get recruiter's jobs
-    jobs = JobOffer.query.filter_by(recruiter_id=current_user.id).all()
-    
-    # Get applications count for each job
-    job_stats = {}
-    for job in jobs:
-        applications_count = Application.query.filter_by(job_id=job.id).count()
-        job_stats[job.id] = {
-            'applications_count': applications_count
-        }
+    # Jobs and their application counters in one query
+    job_rows = JobStatsService.get_recruiter_jobs(current_user.id)
+    jobs = [job for job, _ in job_rows]
+    job_stats = {job.id: stats for job, stats in job_rows}
     
     return render_template(
         'recruiter/dashboard.html',
         jobs=jobs,
-        job_stats=job_stats
+        job_stats=job_stats,
+        job_count=len(jobs),
+        application_count=sum(stats.applications_count for stats in job_stats.values() if stats)
     )
 
 @recruiter_bp.route('/post-job', methods=['GET', 'POST'])
@@ -41,7 +41,6 @@ def post_job():
     
     if request.method == 'POST':
         title = request.form.get('title')
-        company = request.form.get('company')
         location = request.form.get('location')
         description = request.form.get('description')
         requirements = request.form.get('requirements')
@@ -55,18 +54,20 @@ def post_job():
         # Create new job
         job = JobOffer(
             title=title,
-            company=company,
             location=location,
             description=description,
             requirements=requirements,
             salary_range=salary_range,
-            recruiter_id=current_user.id,
+            creator_id=current_user.id,
             is_active=True
         )
         
         try:
             from .. import db
             db.session.add(job)
+            db.session.flush()
+            # Features and scores are computed by the ingestion workers
+            IngestionService.enqueue_scoring(job_id=job.id, commit=False)
             db.session.commit()
             flash('Job posted successfully', 'success')
             return redirect(url_for('recruiter.dashboard'))
@@ -89,13 +90,12 @@ def edit_job(job_id):
     job = JobOffer.query.get_or_404(job_id)
     
     # Ensure job belongs to recruiter
-    if job.recruiter_id != current_user.id:
+    if job.creator_id != current_user.id:
         flash('Access denied. You can only edit your own jobs.', 'danger')
         return redirect(url_for('recruiter.dashboard'))
     
     if request.method == 'POST':
         job.title = request.form.get('title')
-        job.company = request.form.get('company')
         job.location = request.form.get('location')
         job.description = request.form.get('description')
         job.requirements = request.form.get('requirements')
@@ -104,6 +104,7 @@ def edit_job(job_id):
         
         try:
             from .. import db
+            IngestionService.enqueue_scoring(job_id=job.id, commit=False)
             db.session.commit()
             flash('Job updated successfully', 'success')
             return redirect(url_for('recruiter.dashboard'))
@@ -126,24 +127,53 @@ def view_applications(job_id):
     job = JobOffer.query.get_or_404(job_id)
     
     # Ensure job belongs to recruiter
-    if job.recruiter_id != current_user.id:
+    if job.creator_id != current_user.id:
         flash('Access denied. You can only view applications for your own jobs.', 'danger')
         return redirect(url_for('recruiter.dashboard'))
     
-    # Get applications
-    applications = Application.query.filter_by(job_id=job_id).all()
-    
-    # Get matching scores
-    application_scores = {}
-    for application in applications:
-        score = CVMatchingService.get_matching_score(application.candidate_id, job_id)
-        application_scores[application.id] = score
+    # Filters and keyset position from the query string
+    filters = {
+        'min_score': request.args.get('min_score', type=float),
+        'max_score': request.args.get('max_score', type=float),
+        'status': request.args.get('status') or None
+    }
+    applications, next_cursor = CVMatchingService.get_applications_page(
+        job_id, after=request.args.get('after'),
+        limit=current_app.config['APPLICATIONS_PER_PAGE'], **filters
+    )
     
     return render_template(
         'recruiter/applications.html',
         job=job,
         applications=applications,
-        application_scores=application_scores
+        filters=filters,
+        next_cursor=next_cursor,
+        statuses=APPLICATION_STATUSES
+    )
+
+@recruiter_bp.route('/jobs/<int:job_id>/candidates')
+@login_required
+def top_candidates(job_id):
+    """Best matching candidates for a job, whether they applied or not."""
+    if not current_user.is_recruiter():
+        flash('Access denied. Recruiter role required.', 'danger')
+        return redirect(url_for('common.index'))
+    
+    # Get job
+    job = JobOffer.query.get_or_404(job_id)
+    
+    # Ensure job belongs to recruiter
+    if job.creator_id != current_user.id:
+        flash('Access denied. You can only search candidates for your own jobs.', 'danger')
+        return redirect(url_for('recruiter.dashboard'))
+    
+    k = max(1, min(request.args.get('k', current_app.config['RETRIEVAL_TOP_K'], type=int), 500))
+    candidates = CVMatchingService.get_top_candidates(job_id, k)
+    
+    return render_template(
+        'recruiter/top_candidates.html',
+        job=job,
+        candidates=candidates
     )
 
 @recruiter_bp.route('/applications/<int:application_id>/update-status', methods=['POST'])
@@ -161,33 +191,31 @@ def update_application_status(application_id):
     job = JobOffer.query.get_or_404(application.job_id)
     
     # Ensure job belongs to recruiter
-    if job.recruiter_id != current_user.id:
+    if job.creator_id != current_user.id:
         flash('Access denied. You can only update applications for your own jobs.', 'danger')
         return redirect(url_for('recruiter.dashboard'))
     
     # Update status
     new_status = request.form.get('status')
-    if new_status in ['PENDING', 'REVIEWING', 'REJECTED', 'SHORTLISTED', 'INTERVIEW', 'OFFERED', 'ACCEPTED']:
+    if new_status in APPLICATION_STATUSES:
+        from .. import db
+        from ..services.notification_service import NotificationService
+        
         application.status = new_status
         
+        # The candidate's notification is committed with the status change
+        success, message, _ = NotificationService.create_notifications(
+            [application.applicant_id],
+            f"Your application for {job.title} has been updated to {new_status}.",
+            f"application:{application.id}",
+            commit=False
+        )
         try:
-            from .. import db
+            if not success:
+                raise RuntimeError(message)
             db.session.commit()
-            
-            # Create notification for candidate
-            from ..models.notification import Notification
-            from ..services.notification_service import NotificationService
-            
-            message = f"Your application for {job.title} has been updated to {new_status}."
-            NotificationService.create_notification(
-                application.candidate_id,
-                message,
-                f"application:{application.id}"
-            )
-            
             flash('Application status updated successfully', 'success')
         except Exception as e:
-            from .. import db
             db.session.rollback()
             flash(f'Error updating application status: {str(e)}', 'danger')
     else:
@@ -207,7 +235,7 @@ def toggle_job_status(job_id):
     job = JobOffer.query.get_or_404(job_id)
     
     # Ensure job belongs to recruiter
-    if job.recruiter_id != current_user.id:
+    if job.creator_id != current_user.id:
         flash('Access denied. You can only update your own jobs.', 'danger')
         return redirect(url_for('recruiter.dashboard'))
     
@@ -216,6 +244,13 @@ def toggle_job_status(job_id):
     
     try:
         from .. import db
+        from ..services.notification_service import NotificationService
+        if not job.is_active:
+            # Applicants are notified in the same transaction as the closing
+            success, message, _ = NotificationService.notify_job_closed(job, commit=False)
+            if not success:
+                raise RuntimeError(message)
+        IngestionService.enqueue_scoring(job_id=job.id, commit=False)
         db.session.commit()
         
         status = "activated" if job.is_active else "deactivated"
@@ -1,3 +1,9 @@
 from .auth_service import AuthService
 from .cv_matching_service import CVMatchingService
-from .notification_service import NotificationService
\ No newline at end of file
+from .notification_service import NotificationService
+from .feature_store_service import FeatureStoreService
+from .retrieval_service import RetrievalService
+from .ingestion_service import IngestionService
+from .import_service import ImportService
+from .job_feed_service import JobFeedService
+from .job_stats_service import JobStatsService
\ No newline at end of file
@@ -1,37 +1,61 @@
+import atexit
 import os
+from datetime import datetime
 from flask import current_app
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import joinedload
 from werkzeug.utils import secure_filename
 import uuid
 from ..models.application import Application
 from ..models.job import JobOffer
 from ..models.user import User
-from ..ai.cv_matcher import CVMatcher
+from ..models.match_score import MatchScore
+from ..ai.model_registry import registry
+from ..ai.document_extractor import ExtractionError
+from .feature_store_service import FeatureStoreService
+from .retrieval_service import RetrievalService
 from .. import db
 
+_extraction_pool = None
+_extraction_pool_pid = None
+
+def _get_extraction_pool():
+    """Get this process's document extraction pool, sized from config."""
+    global _extraction_pool, _extraction_pool_pid
+    from ..ai.document_extractor import ExtractionPool
+    
+    # A pool inherited through fork belongs to the parent process
+    if _extraction_pool is None or _extraction_pool_pid != os.getpid():
+        config = current_app.config
+        _extraction_pool = ExtractionPool(
+            workers=config['EXTRACTION_WORKERS'],
+            timeout=config['EXTRACTION_TIMEOUT_SECONDS'],
+            max_pages=config['EXTRACTION_MAX_PAGES'],
+            memory_limit=config['EXTRACTION_MEMORY_MB'] * 1024 * 1024
+        )
+        _extraction_pool_pid = os.getpid()
+        atexit.register(_extraction_pool.close)
+    return _extraction_pool
+
 class CVMatchingService:
     """Service for CV matching operations."""
     
     def __init__(self):
-        self.cv_matcher = CVMatcher()
-        model_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
-            'data', 'models', 'cv_matcher_model.pkl'
+        # The matcher is loaded once per process and shared
+        self.cv_matcher = registry.get(
+            current_app.config['MODEL_PATH'],
+            fast_tokenizer=current_app.config.get('FAST_TOKENIZER')
         )
-        # Try to load pre-trained model
-        self.cv_matcher.load_model(model_path)
     
     def extract_text_from_resume(self, file_path):
-        """Extract text from resume file."""
-        # In a real implementation, we would handle different file types
-        # (PDF, DOCX, etc.) using appropriate libraries
+        """Extract text from a PDF, DOCX or text resume file.
         
-        # For simplicity, we'll just read the file as text
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            print(f"Error extracting text from resume: {e}")
-            return ""
+        Parsing runs in the extraction process pool under time, page and
+        memory limits; raises ExtractionError if the file cannot be read.
+        Callers go through get_resume_features, which only extracts files
+        whose hash has no stored text yet.
+        """
+        return _get_extraction_pool().extract(file_path)
     
     def save_resume(self, file):
         """Save uploaded resume file."""
@@ -50,6 +74,53 @@ class CVMatchingService:
         except Exception as e:
             return None, f"Error saving resume: {str(e)}"
     
+    def get_resume_features(self, file_path):
+        """Get cached text and matching features for a resume file."""
+        return FeatureStoreService.get_resume_features(
+            file_path, self.cv_matcher, self.extract_text_from_resume
+        )
+    
+    @staticmethod
+    def process_resume(candidate_id, file_path):
+        """Extract and cache the features of a candidate's uploaded resume.
+        
+        Stored match scores computed from a previous resume are dropped,
+        scores against the retrieved active jobs are precomputed and the
+        applications sent while the resume was queued get their score.
+        """
+        user = User.query.get(candidate_id)
+        if not user or not user.is_candidate():
+            return False, "Invalid candidate"
+        
+        try:
+            service = CVMatchingService()
+            resume_features = service.get_resume_features(file_path)
+            user.resume_hash = resume_features['file_hash']
+            CVMatchingService.invalidate_candidate_scores(
+                candidate_id, keep_resume_hash=resume_features['file_hash']
+            )
+            RetrievalService.index_candidates([user], service.cv_matcher)
+            service.refresh_candidate_scores(user)
+            service.score_pending_applications(user, file_path)
+            return True, "Resume processed successfully"
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error processing resume: {str(e)}"
+    
+    @staticmethod
+    def rescore_candidate(candidate_id):
+        """Precompute missing scores of a processed resume, e.g. after a model change."""
+        user = User.query.get(candidate_id)
+        if not user or not user.resume_hash:
+            return True, "No processed resume to score"
+        
+        try:
+            CVMatchingService().refresh_candidate_scores(user)
+            return True, "Candidate scores updated"
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error updating candidate scores: {str(e)}"
+    
     def process_application(self, job_id, applicant_id, resume_file, cover_letter=None):
         """Process a job application with CV matching."""
         # Check if job exists
@@ -67,11 +138,18 @@ class CVMatchingService:
         if error:
             return False, error, None
         
-        # Extract text from resume
-        resume_text = self.extract_text_from_resume(resume_path)
+        # Extract text and features from resume
+        try:
+            resume_features = self.get_resume_features(resume_path)
+        except ExtractionError as e:
+            return False, f"Could not read resume: {str(e)}", None
+        resume_text = resume_features['text']
         
         # Calculate match percentage
-        match_percentage = self.cv_matcher.predict_match(resume_text, job.description) * 100
+        job_features = FeatureStoreService.get_job_features([job], self.cv_matcher)
+        match_percentage = self.cv_matcher.predict_match_features(
+            [resume_features], job_features
+        )[0] * 100
         
         # Create application record
         application = Application(
@@ -93,12 +171,447 @@ class CVMatchingService:
             db.session.rollback()
             return False, f"Error submitting application: {str(e)}", None
     
-    def get_matched_applications(self, job_id, min_match_percentage=0):
-        """Get applications for a job with match percentage above threshold."""
-        return Application.query.filter(
+    def _store_scores(self, pairs):
+        """Upsert computed scores into the match_scores table.
+        
+        `pairs` is a list of (candidate_id, job_id, score, resume_hash,
+        job_hash) tuples.
+        """
+        if not pairs:
+            return
+        
+        model_version = self.cv_matcher.model_version
+        candidate_ids = {pair[0] for pair in pairs}
+        job_ids = {pair[1] for pair in pairs}
+        existing = {
+            (row.candidate_id, row.job_id): row
+            for row in MatchScore.query.filter(
+                MatchScore.candidate_id.in_(candidate_ids),
+                MatchScore.job_id.in_(job_ids)
+            ).all()
+        }
+        
+        for candidate_id, job_id, score, resume_hash, job_hash in pairs:
+            row = existing.get((candidate_id, job_id))
+            if row is None:
+                row = MatchScore(candidate_id=candidate_id, job_id=job_id)
+                db.session.add(row)
+            row.score = score
+            row.model_version = model_version
+            row.resume_hash = resume_hash
+            row.job_hash = job_hash
+        
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    def score_candidate_jobs(self, user, jobs):
+        """Compute and store scores between one candidate and several jobs.
+        
+        Returns a dict mapping job id to match percentage.
+        """
+        jobs = list(jobs)
+        if not jobs or not user.resume_path or not user.resume_hash:
+            return {}
+        
+        try:
+            resume_features = self.get_resume_features(user.resume_path)
+        except ExtractionError as e:
+            current_app.logger.warning('Cannot score resume of candidate %d: %s', user.id, e)
+            return {}
+        job_features = FeatureStoreService.get_job_features(jobs, self.cv_matcher)
+        scores = self.cv_matcher.predict_match_features([resume_features], job_features)
+        
+        self._store_scores([
+            (user.id, job.id, score * 100, resume_features['file_hash'], job.content_hash())
+            for job, score in zip(jobs, scores)
+        ])
+        return {job.id: score * 100 for job, score in zip(jobs, scores)}
+    
+    def score_job_candidates(self, job, candidates):
+        """Compute and store scores between one job and several candidates.
+        
+        Returns a dict mapping candidate id to match percentage.
+        """
+        # Resumes still queued for processing are scored by the ingestion workers
+        candidates = [candidate for candidate in candidates if candidate.resume_path and candidate.resume_hash]
+        if not candidates:
+            return {}
+        
+        resume_features = []
+        readable = []
+        for candidate in candidates:
+            try:
+                resume_features.append(self.get_resume_features(candidate.resume_path))
+                readable.append(candidate)
+            except ExtractionError as e:
+                current_app.logger.warning('Skipping resume of candidate %d: %s', candidate.id, e)
+        candidates = readable
+        if not candidates:
+            return {}
+        
+        job_features = FeatureStoreService.get_job_features([job], self.cv_matcher)
+        scores = self.cv_matcher.predict_match_features(resume_features, job_features)
+        
+        job_hash = job.content_hash()
+        self._store_scores([
+            (candidate.id, job.id, score * 100, features['file_hash'], job_hash)
+            for candidate, features, score in zip(candidates, resume_features, scores)
+        ])
+        return {candidate.id: score * 100 for candidate, score in zip(candidates, scores)}
+    
+    def retrieve_jobs(self, user, k=None):
+        """Get the active jobs worth scoring for a candidate.
+        
+        Only the top-k jobs by TF-IDF cosine similarity to the resume are
+        returned, so the classifier never runs over the whole job table;
+        the k newest active jobs are returned when no fitted vectorizer is
+        available. Resumes still queued for processing retrieve nothing.
+        """
+        if not user.resume_path or not user.resume_hash:
+            return []
+        
+        k = k or current_app.config.get('RETRIEVAL_TOP_K', 50)
+        try:
+            resume_features = self.get_resume_features(user.resume_path)
+        except ExtractionError as e:
+            current_app.logger.warning('Cannot retrieve jobs for candidate %d: %s', user.id, e)
+            return []
+        hits = RetrievalService.search_jobs(resume_features, self.cv_matcher, k)
+        if hits is None:
+            return JobOffer.query.filter_by(is_active=True).order_by(
+                JobOffer.created_at.desc()
+            ).limit(k).all()
+        if not hits:
+            return []
+        
+        return JobOffer.query.filter(
+            JobOffer.id.in_([job_id for job_id, _ in hits]),
+            JobOffer.is_active.is_(True)
+        ).all()
+    
+    def refresh_candidate_scores(self, user):
+        """Precompute missing or outdated scores of a candidate for their retrieved jobs."""
+        jobs = self.retrieve_jobs(user)
+        fresh_ids = {
+            row.job_id for row in MatchScore.query.filter_by(
+                candidate_id=user.id, model_version=self.cv_matcher.model_version,
+                resume_hash=user.resume_hash
+            ).with_entities(MatchScore.job_id)
+        }
+        return self.score_candidate_jobs(user, [job for job in jobs if job.id not in fresh_ids])
+    
+    def score_pending_applications(self, user, resume_path):
+        """Score the applications sent with a resume before it was processed.
+        
+        Returns the number of applications scored.
+        """
+        applications = Application.query.filter(
+            Application.applicant_id == user.id,
+            Application.resume_path == resume_path,
+            Application.match_percentage.is_(None)
+        ).all()
+        if not applications:
+            return 0
+        
+        scores = self.score_candidate_jobs(user, [application.job for application in applications])
+        for application in applications:
+            application.match_percentage = scores.get(application.job_id)
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return len(applications)
+    
+    def score_job_applications(self, job):
+        """Score the applications of a job sent before a score was stored.
+        
+        Returns the number of applications scored.
+        """
+        applications = Application.query.options(joinedload(Application.applicant)).filter(
+            Application.job_id == job.id,
+            Application.match_percentage.is_(None)
+        ).all()
+        if not applications:
+            return 0
+        
+        scores = self.score_job_candidates(job, {application.applicant for application in applications})
+        for application in applications:
+            application.match_percentage = scores.get(application.applicant_id)
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return sum(application.applicant_id in scores for application in applications)
+    
+    def retrieve_candidates(self, job, k=None):
+        """Get the candidates worth scoring for a job.
+        
+        Only the top-k candidates by TF-IDF cosine similarity between their
+        current resume and the job are returned; the k newest candidates
+        with a resume are returned when no fitted vectorizer is available,
+        so a recruiter request never scores the whole candidate table.
+        """
+        k = k or current_app.config.get('RETRIEVAL_TOP_K', 50)
+        job_features = FeatureStoreService.get_job_features([job], self.cv_matcher)[0]
+        hits = RetrievalService.search_candidates(job_features, self.cv_matcher, k)
+        if hits is None:
+            return User.query.filter(
+                User.role == 'candidate',
+                User.resume_hash.isnot(None)
+            ).order_by(User.id.desc()).limit(k).all()
+        if not hits:
+            return []
+        
+        return User.query.filter(User.id.in_([user_id for user_id, _ in hits])).all()
+    
+    def refresh_job_scores(self, job):
+        """Precompute missing or outdated scores of a job for its retrieved candidates."""
+        candidates = self.retrieve_candidates(job)
+        fresh_ids = {
+            row.candidate_id for row in MatchScore.query.join(
+                User, User.id == MatchScore.candidate_id
+            ).filter(
+                MatchScore.job_id == job.id,
+                MatchScore.model_version == self.cv_matcher.model_version,
+                MatchScore.resume_hash == User.resume_hash
+            ).with_entities(MatchScore.candidate_id)
+        }
+        return self.score_job_candidates(job, [c for c in candidates if c.id not in fresh_ids])
+    
+    @staticmethod
+    def invalidate_candidate_scores(candidate_id, keep_resume_hash=None):
+        """Drop stored scores of a candidate, except those for the given resume."""
+        query = MatchScore.query.filter(MatchScore.candidate_id == candidate_id)
+        if keep_resume_hash:
+            query = query.filter(MatchScore.resume_hash != keep_resume_hash)
+        query.delete(synchronize_session=False)
+        db.session.commit()
+    
+    @staticmethod
+    def get_matching_scores(candidate_id, jobs):
+        """Get match percentages between a candidate's resume and several jobs.
+        
+        Only stored scores of the current model and resume are returned;
+        missing ones are precomputed by the ingestion workers, so requests
+        never run the classifier. Resumes still queued for processing have
+        no scores yet. Returns a dict mapping job id to match percentage.
+        """
+        jobs = list(jobs)
+        user = User.query.get(candidate_id)
+        if not jobs or not user or not user.resume_hash:
+            return {}
+        
+        service = CVMatchingService()
+        scores = {
+            row.job_id: row.score
+            for row in MatchScore.query.filter(
+                MatchScore.candidate_id == candidate_id,
+                MatchScore.model_version == service.cv_matcher.model_version,
+                MatchScore.resume_hash == user.resume_hash,
+                MatchScore.job_id.in_([job.id for job in jobs])
+            ).all()
+        }
+        return scores
+    
+    @staticmethod
+    def get_top_jobs(candidate_id, k=None):
+        """Get a candidate's best matching active jobs, best first.
+        
+        Read from the scores the ingestion workers stored for the current
+        model and resume. Returns a list of (job, match percentage) pairs.
+        """
+        user = User.query.get(candidate_id)
+        if not user or not user.resume_hash:
+            return []
+        
+        k = k or current_app.config.get('RETRIEVAL_TOP_K', 50)
+        rows = db.session.query(JobOffer, MatchScore.score).join(
+            MatchScore, MatchScore.job_id == JobOffer.id
+        ).filter(
+            MatchScore.candidate_id == candidate_id,
+            MatchScore.model_version == CVMatchingService().cv_matcher.model_version,
+            MatchScore.resume_hash == user.resume_hash,
+            JobOffer.is_active.is_(True)
+        ).order_by(MatchScore.score.desc()).limit(k).all()
+        return [(job, score) for job, score in rows]
+    
+    @staticmethod
+    def get_recent_jobs(exclude_ids=(), before=None, limit=20):
+        """Get one page of active jobs, newest first.
+        
+        Pages are read by keyset on the (is_active, created_at) index;
+        `before` is the cursor of the last job of the previous page and
+        `exclude_ids` are left out, e.g. jobs already shown as top matches.
+        Returns (jobs, next_cursor).
+        """
+        limit = max(1, limit)
+        query = JobOffer.query.filter(JobOffer.is_active.is_(True))
+        if exclude_ids:
+            query = query.filter(JobOffer.id.notin_(list(exclude_ids)))
+        
+        if before:
+            try:
+                created_at, job_id = before.rsplit('_', 1)
+                position = (datetime.fromisoformat(created_at), int(job_id))
+            except ValueError:
+                position = None
+            if position is not None:
+                query = query.filter(tuple_(JobOffer.created_at, JobOffer.id) < position)
+        
+        # One extra row tells whether there is a next page
+        jobs = query.order_by(JobOffer.created_at.desc(), JobOffer.id.desc()).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = f'{jobs[-1].created_at.isoformat()}_{jobs[-1].id}'
+        return jobs, next_cursor
+    
+    @staticmethod
+    def get_matching_score(candidate_id, job_id):
+        """Get match percentage between a candidate's resume and a job."""
+        job = JobOffer.query.get(job_id)
+        if not job:
+            return None
+        return CVMatchingService.get_matching_scores(candidate_id, [job]).get(job.id)
+    
+    @staticmethod
+    def get_candidate_scores(job_id, candidate_ids):
+        """Get match percentages between a job and several candidates' resumes.
+        
+        Only stored scores of the current model and resumes are returned;
+        missing ones are precomputed by the ingestion workers. Returns a
+        dict mapping candidate id to match percentage.
+        """
+        job = JobOffer.query.get(job_id)
+        candidate_ids = set(candidate_ids)
+        if not job or not candidate_ids:
+            return {}
+        
+        service = CVMatchingService()
+        scores = {
+            row.candidate_id: row.score
+            for row in MatchScore.query.join(User, User.id == MatchScore.candidate_id).filter(
+                MatchScore.job_id == job_id,
+                MatchScore.model_version == service.cv_matcher.model_version,
+                MatchScore.resume_hash == User.resume_hash,
+                MatchScore.candidate_id.in_(candidate_ids)
+            ).all()
+        }
+        return scores
+    
+    @staticmethod
+    def get_top_candidates(job_id, k=None):
+        """Get the best matching candidates for a job, best first.
+        
+        Read from the scores the ingestion workers stored for the current
+        model and the candidates' current resumes. Returns a list of (user,
+        match percentage) pairs.
+        """
+        k = k or current_app.config.get('RETRIEVAL_TOP_K', 50)
+        rows = db.session.query(User, MatchScore.score).join(
+            MatchScore, MatchScore.candidate_id == User.id
+        ).filter(
+            MatchScore.job_id == job_id,
+            MatchScore.model_version == CVMatchingService().cv_matcher.model_version,
+            MatchScore.resume_hash == User.resume_hash
+        ).order_by(MatchScore.score.desc()).limit(k).all()
+        return [(candidate, score) for candidate, score in rows]
+    
+    def update_job_features(self, job):
+        """Refresh the stored matching features, index entry and scores of a job.
+        
+        Features are only recomputed if the job text changed, which also
+        drops the job's stored scores; missing scores of the retrieved
+        candidates and of unscored applications are then precomputed.
+        Inactive jobs are removed from the retrieval index. Run by the
+        ingestion workers for queued scoring tasks.
+        """
+        try:
+            FeatureStoreService.update_job_features([job], self.cv_matcher)
+            RetrievalService.index_jobs([job], self.cv_matcher)
+            if job.is_active:
+                self.refresh_job_scores(job)
+                self.score_job_applications(job)
+            return True, "Job features updated"
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error updating job features: {str(e)}"
+    
+    @staticmethod
+    def encode_cursor(application):
+        """Encode the keyset position just after an application."""
+        return f'{application.match_percentage}:{application.id}'
+    
+    @staticmethod
+    def decode_cursor(cursor):
+        """Decode a cursor into (match_percentage, id), or None if invalid."""
+        try:
+            score, application_id = cursor.split(':')
+            return float(score), int(application_id)
+        except (AttributeError, ValueError):
+            return None
+    
+    @staticmethod
+    def get_applications_page(job_id, min_score=None, max_score=None, status=None, after=None, limit=25):
+        """Get one page of a job's applications, best match first.
+        
+        Pages are fetched by keyset on the (job_id, match_percentage, id)
+        index: `after` is the cursor of the last application of the
+        previous page, so every page costs the same index range scan.
+        Score and status filters are applied in SQL. Applications without
+        a match percentage are not listed.
+        
+        Returns (applications, next_cursor); next_cursor is None on the
+        last page.
+        """
+        query = Application.query.options(joinedload(Application.applicant)).filter(
             Application.job_id == job_id,
-            Application.match_percentage >= min_match_percentage
-        ).order_by(Application.match_percentage.desc()).all()
+            Application.match_percentage.isnot(None)
+        )
+        if min_score is not None:
+            query = query.filter(Application.match_percentage >= min_score)
+        if max_score is not None:
+            query = query.filter(Application.match_percentage <= max_score)
+        if status:
+            # Statuses are stored in either case
+            query = query.filter(func.lower(Application.status) == status.lower())
+        
+        position = CVMatchingService.decode_cursor(after) if after else None
+        if position is not None:
+            query = query.filter(tuple_(Application.match_percentage, Application.id) < position)
+        
+        # One extra row tells whether there is a next page
+        applications = query.order_by(
+            Application.match_percentage.desc(), Application.id.desc()
+        ).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(applications) > limit:
+            applications = applications[:limit]
+            next_cursor = CVMatchingService.encode_cursor(applications[-1])
+        return applications, next_cursor
+    
+    def get_matched_applications(self, job_id, min_match_percentage=0, status=None, page_size=500):
+        """Get applications for a job with match percentage above threshold.
+        
+        Applications are read page by page through get_applications_page,
+        best match first.
+        """
+        applications = []
+        cursor = None
+        while True:
+            page, cursor = CVMatchingService.get_applications_page(
+                job_id, min_score=min_match_percentage, status=status, after=cursor, limit=page_size
+            )
+            applications.extend(page)
+            if cursor is None:
+                return applications
     
     def update_application_status(self, application_id, new_status, recruiter_notes=None):
         """Update application status."""
@@ -116,4 +629,22 @@ class CVMatchingService:
             return True, f"Application status updated to {new_status}"
         except Exception as e:
             db.session.rollback()
-            return False, f"Error updating application status: {str(e)}"
\ No newline at end of file
+            return False, f"Error updating application status: {str(e)}"
+    
+    @staticmethod
+    def warmup():
+        """Load the model and NLP data into the registry and run one prediction.
+        
+        Called from create_app when WARMUP_ON_STARTUP is set, so that the
+        first scoring request does not pay the import and load cost.
+        """
+        return registry.load(
+            current_app.config['MODEL_PATH'],
+            fast_tokenizer=current_app.config.get('FAST_TOKENIZER'),
+            warmup=True
+        )
+    
+    @staticmethod
+    def readiness():
+        """Report whether the scoring model is loaded and warmed up."""
+        return registry.status()
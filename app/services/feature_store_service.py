@@ -0,0 +1,298 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from flask import current_app
+from ..ai.document_extractor import ExtractionError
+from ..models.job_features import JobFeatures
+from ..models.match_score import MatchScore
+from ..models.resume_features import ResumeFeatures
+from .. import db
+
+class _LRUCache:
+    """Small thread-safe LRU mapping used as the in-memory feature tier."""
+    
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+_resume_cache = None
+
+def _get_resume_cache():
+    """Get the process-wide resume feature cache, sized from config."""
+    global _resume_cache
+    if _resume_cache is None:
+        _resume_cache = _LRUCache(current_app.config.get('RESUME_FEATURE_CACHE_SIZE', 256))
+    return _resume_cache
+
+class FeatureStoreService:
+    """Service for persisting precomputed matching features."""
+    
+    @staticmethod
+    def _is_stale(record, content_hash, extractor_version):
+        """Check whether a stored job feature record must be recomputed."""
+        if record is None or record.content_hash != content_hash:
+            return True
+        return FeatureStoreService._is_outdated(record.extractor_version, extractor_version)
+    
+    @staticmethod
+    def _is_outdated(stored_version, extractor_version):
+        """Check whether stored vectors were computed by another extractor."""
+        # Only require a matching extractor when one is actually fitted;
+        # otherwise vectors are computed at scoring time anyway.
+        return extractor_version is not None and stored_version != extractor_version
+    
+    @staticmethod
+    def feature_columns(features):
+        """Get the feature table column values for computed matching features."""
+        import numpy as np
+        
+        columns = {
+            'processed_text': features['processed_text'],
+            'skills': json.dumps(features['skills']),
+            'extractor_version': features['extractor_version'],
+            'tfidf_indices': None,
+            'tfidf_values': None,
+            'tfidf_size': None
+        }
+        
+        vector = features['tfidf']
+        if vector is not None:
+            columns['tfidf_indices'] = vector.indices.astype(np.int32).tobytes()
+            columns['tfidf_values'] = vector.data.astype(np.float64).tobytes()
+            columns['tfidf_size'] = vector.shape[1]
+        return columns
+    
+    @staticmethod
+    def _store_features(record, features):
+        """Copy computed matching features onto a feature record."""
+        for name, value in FeatureStoreService.feature_columns(features).items():
+            setattr(record, name, value)
+    
+    @staticmethod
+    def _load_features(record):
+        """Rebuild the feature dict used by CVMatcher from a feature record."""
+        import numpy as np
+        from scipy import sparse
+        
+        vector = None
+        if record.tfidf_indices is not None and record.tfidf_size:
+            indices = np.frombuffer(record.tfidf_indices, dtype=np.int32)
+            values = np.frombuffer(record.tfidf_values, dtype=np.float64)
+            vector = sparse.csr_matrix(
+                (values, indices, np.array([0, len(indices)])),
+                shape=(1, record.tfidf_size)
+            )
+        
+        return {
+            'processed_text': record.processed_text or '',
+            'skills': json.loads(record.skills) if record.skills else [],
+            'tfidf': vector,
+            'extractor_version': record.extractor_version
+        }
+    
+    @staticmethod
+    def _commit():
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    @staticmethod
+    def update_job_features(jobs, cv_matcher, commit=True, executor=None):
+        """Recompute stored features for jobs whose matching text changed.
+        
+        `executor` optionally runs the text pipeline in a process pool.
+        Returns the number of jobs whose features were recomputed.
+        """
+        jobs = [job for job in jobs if job.id is not None]
+        if not jobs:
+            return 0
+        
+        records = {
+            record.job_id: record
+            for record in JobFeatures.query.filter(
+                JobFeatures.job_id.in_([job.id for job in jobs])
+            ).all()
+        }
+        
+        version = cv_matcher.features_version
+        stale_jobs = [
+            job for job in jobs
+            if FeatureStoreService._is_stale(records.get(job.id), job.content_hash(), version)
+        ]
+        if not stale_jobs:
+            return 0
+        
+        # Scores computed against the previous job text are no longer valid
+        changed_ids = [
+            job.id for job in stale_jobs
+            if job.id in records and records[job.id].content_hash != job.content_hash()
+        ]
+        if changed_ids:
+            MatchScore.query.filter(MatchScore.job_id.in_(changed_ids)).delete(
+                synchronize_session=False
+            )
+        
+        computed = cv_matcher.compute_job_features([job.description for job in stale_jobs], executor)
+        for job, features in zip(stale_jobs, computed):
+            record = records.get(job.id)
+            if record is None:
+                record = JobFeatures(job_id=job.id)
+                db.session.add(record)
+            FeatureStoreService._store_features(record, features)
+            record.content_hash = job.content_hash()
+        
+        if commit:
+            FeatureStoreService._commit()
+        
+        return len(stale_jobs)
+    
+    @staticmethod
+    def get_job_features(jobs, cv_matcher):
+        """Get matching features for jobs, in the order given.
+        
+        Missing or stale records are recomputed and stored first.
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        
+        FeatureStoreService.update_job_features(jobs, cv_matcher)
+        
+        records = {
+            record.job_id: record
+            for record in JobFeatures.query.filter(
+                JobFeatures.job_id.in_([job.id for job in jobs])
+            ).all()
+        }
+        return [FeatureStoreService._load_features(records[job.id]) for job in jobs]
+    
+    @staticmethod
+    def update_resume_features(records, cv_matcher, commit=True, batch_size=1000):
+        """Recompute resume feature records computed by another extractor.
+        
+        The stored extracted text is reused, so resume files are not read
+        again. Returns the number of records recomputed.
+        """
+        version = cv_matcher.features_version
+        records = [
+            record for record in records
+            if record.extraction_error is None
+            and FeatureStoreService._is_outdated(record.extractor_version, version)
+        ]
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            computed = cv_matcher.compute_resume_features(
+                [record.extracted_text or '' for record in batch]
+            )
+            for record, features in zip(batch, computed):
+                FeatureStoreService._store_features(record, features)
+            if commit:
+                FeatureStoreService._commit()
+        
+        return len(records)
+    
+    @staticmethod
+    def hash_file(file_path):
+        """Compute the SHA-256 of a file's bytes."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _record_extraction_failure(record, file_hash, error):
+        """Remember that a resume file could not be extracted."""
+        if record is None:
+            record = ResumeFeatures(file_hash=file_hash)
+            db.session.add(record)
+        record.extraction_error = error
+        record.updated_at = datetime.utcnow()
+        try:
+            db.session.commit()
+        except Exception:
+            # Another worker may have stored the same file concurrently
+            db.session.rollback()
+    
+    @staticmethod
+    def get_resume_features(file_path, cv_matcher, extract_text):
+        """Get extracted text and matching features for a resume file.
+        
+        Features are keyed by the SHA-256 of the file bytes, looked up in
+        the in-memory LRU tier, then in the resume_features table, and only
+        computed with `extract_text` and the NLP pipeline on a miss.
+        Extraction failures are stored on the record and raised again as
+        ExtractionError until EXTRACTION_RETRY_SECONDS have passed.
+        Returns the feature dict with added 'text' and 'file_hash' entries.
+        """
+        file_hash = FeatureStoreService.hash_file(file_path)
+        version = cv_matcher.features_version
+        cache = _get_resume_cache()
+        
+        features = cache.get(file_hash)
+        if features is not None and not FeatureStoreService._is_outdated(
+            features['extractor_version'], version
+        ):
+            return features
+        
+        record = ResumeFeatures.query.filter_by(file_hash=file_hash).first()
+        failed = record is not None and record.extraction_error is not None
+        if failed:
+            # A file that failed recently is not extracted again on every request
+            retry_after = timedelta(seconds=current_app.config.get('EXTRACTION_RETRY_SECONDS', 3600))
+            if record.updated_at and datetime.utcnow() - record.updated_at < retry_after:
+                raise ExtractionError(record.extraction_error)
+        
+        if record is None or failed or FeatureStoreService._is_outdated(record.extractor_version, version):
+            if record is None or failed:
+                try:
+                    text = extract_text(file_path)
+                except ExtractionError as e:
+                    FeatureStoreService._record_extraction_failure(record, file_hash, str(e))
+                    raise
+                if record is None:
+                    record = ResumeFeatures(file_hash=file_hash)
+                    db.session.add(record)
+                record.extracted_text = text
+                record.extraction_error = None
+            
+            computed = cv_matcher.compute_resume_features([record.extracted_text or ''])[0]
+            FeatureStoreService._store_features(record, computed)
+            try:
+                FeatureStoreService._commit()
+            except Exception:
+                # Another worker may have stored the same file concurrently
+                record = ResumeFeatures.query.filter_by(file_hash=file_hash).first()
+                if record is None:
+                    raise
+        
+        features = FeatureStoreService._load_features(record)
+        features['text'] = record.extracted_text or ''
+        features['file_hash'] = file_hash
+        cache.put(file_hash, features)
+        return features
@@ -0,0 +1,229 @@
+import hashlib
+import os
+import re
+import secrets
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import or_
+from werkzeug.security import generate_password_hash
+from werkzeug.utils import secure_filename
+from ..models.resume_features import ResumeFeatures
+from ..models.user import User
+from .feature_store_service import FeatureStoreService
+from .. import db
+
+class ImportService:
+    """Service for bulk importing existing resumes as candidate accounts."""
+    
+    @staticmethod
+    def _is_resume(name):
+        extension = os.path.splitext(name)[1].lower().lstrip('.')
+        return extension in current_app.config['ALLOWED_EXTENSIONS']
+    
+    @staticmethod
+    def _read_file(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    
+    @staticmethod
+    def iter_resume_files(source):
+        """Yield (name, read) for every resume in a directory, zip or tar archive.
+        
+        `read` returns the file's bytes. Files are yielded in a stable order
+        so that interrupted imports go over the same files again.
+        """
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    if ImportService._is_resume(name):
+                        path = os.path.join(root, name)
+                        yield os.path.relpath(path, source), lambda path=path: ImportService._read_file(path)
+        elif zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                for info in sorted(archive.infolist(), key=lambda info: info.filename):
+                    if not info.is_dir() and ImportService._is_resume(info.filename):
+                        yield info.filename, lambda info=info: archive.read(info)
+        elif tarfile.is_tarfile(source):
+            with tarfile.open(source) as archive:
+                for member in archive:
+                    if member.isfile() and ImportService._is_resume(member.name):
+                        data = archive.extractfile(member).read()
+                        yield member.name, lambda data=data: data
+        else:
+            raise ValueError(f'{source} is not a directory, zip or tar archive')
+    
+    @staticmethod
+    def _candidate_fields(name, file_hash, email_domain, taken=()):
+        """Derive a unique username and placeholder email for an imported resume.
+        
+        `taken` holds usernames and emails already in use; a counter is
+        appended on the rare collision.
+        """
+        stem = os.path.splitext(os.path.basename(name))[0]
+        slug = re.sub(r'[^a-z0-9]+', '-', stem.lower()).strip('-')[:40] or 'candidate'
+        base = f'{slug}-{file_hash[:16]}'
+        username, suffix = base, 1
+        while username in taken or f'{username}@{email_domain}' in taken:
+            suffix += 1
+            username = f'{base}-{suffix}'
+        return username, f'{username}@{email_domain}'
+    
+    @staticmethod
+    def _taken_names(condition):
+        """Get the usernames and emails of the users matching a condition."""
+        return {
+            value for row in User.query.filter(condition).with_entities(User.username, User.email)
+            for value in row
+        }
+    
+    @staticmethod
+    def import_resumes(source, cv_matcher, batch_size=500, workers=None,
+                       email_domain='import.local', report=None):
+        """Import every resume under `source` as a candidate with stored features.
+        
+        Files are processed in batches: they are copied to the upload
+        folder, their text is extracted in the extraction process pool and
+        their features are computed across `workers` processes; then the
+        batch's users and resume_features rows are inserted in one
+        transaction. Files whose content was already imported are skipped,
+        so an interrupted import can simply be run again. Imported accounts
+        get an unusable password until they are reset.
+        
+        `report` is called with a stats dict after each batch. Returns the
+        final stats.
+        """
+        from ..ai.document_extractor import ExtractionError, ExtractionPool
+        from ..ai.preprocessing import create_executor
+        
+        config = current_app.config
+        logger = current_app.logger
+        workers = workers or os.cpu_count() or 1
+        upload_folder = config['UPLOAD_FOLDER']
+        os.makedirs(upload_folder, exist_ok=True)
+        
+        imported_hashes = {
+            file_hash for file_hash, in User.query.filter(
+                User.resume_hash.isnot(None)
+            ).with_entities(User.resume_hash)
+        }
+        feature_hashes = {
+            file_hash for file_hash, in ResumeFeatures.query.filter(
+                ResumeFeatures.extraction_error.is_(None)
+            ).with_entities(ResumeFeatures.file_hash)
+        }
+        password_hash = generate_password_hash(secrets.token_urlsafe(32))
+        
+        stats = {'seen': 0, 'imported': 0, 'skipped': 0, 'failed': 0, 'bytes': 0, 'seconds': 0.0}
+        started = time.perf_counter()
+        pool = ExtractionPool(
+            workers=workers,
+            timeout=config['EXTRACTION_TIMEOUT_SECONDS'],
+            max_pages=config['EXTRACTION_MAX_PAGES'],
+            memory_limit=config['EXTRACTION_MEMORY_MB'] * 1024 * 1024
+        )
+        executor = create_executor(workers, cv_matcher.text_processor) if workers > 1 else None
+        
+        def extract(item):
+            try:
+                return pool.extract(item['path'])
+            except ExtractionError as e:
+                logger.warning('Could not import %s: %s', item['name'], e)
+                return None
+        
+        def flush(batch):
+            with ThreadPoolExecutor(max_workers=workers) as threads:
+                texts = list(threads.map(extract, batch))
+            
+            readable = [(item, text) for item, text in zip(batch, texts) if text is not None]
+            stats['failed'] += len(batch) - len(readable)
+            new_texts = [(item, text) for item, text in readable if item['hash'] not in feature_hashes]
+            computed = cv_matcher.compute_resume_features([text for _, text in new_texts], executor)
+            
+            now = datetime.utcnow()
+            features_rows = []
+            for (item, text), features in zip(new_texts, computed):
+                row = FeatureStoreService.feature_columns(features)
+                row.update(file_hash=item['hash'], extracted_text=text, created_at=now, updated_at=now)
+                features_rows.append(row)
+                feature_hashes.add(item['hash'])
+            
+            fields = [
+                ImportService._candidate_fields(item['name'], item['hash'], email_domain)
+                for item, _ in readable
+            ]
+            taken = ImportService._taken_names(
+                or_(User.username.in_([username for username, _ in fields]),
+                    User.email.in_([email for _, email in fields]))
+            )
+            
+            user_rows = []
+            for (item, _), (username, email) in zip(readable, fields):
+                if username in taken or email in taken:
+                    # Earlier collisions were given the same prefix
+                    taken |= ImportService._taken_names(
+                        or_(User.username.like(f'{username}-%'), User.email.like(f'{username}-%'))
+                    )
+                    username, email = ImportService._candidate_fields(
+                        item['name'], item['hash'], email_domain, taken
+                    )
+                taken.update((username, email))
+                user_rows.append({
+                    'username': username, 'email': email, 'password_hash': password_hash,
+                    'role': 'candidate', 'resume_path': item['path'], 'resume_hash': item['hash'],
+                    'created_at': now, 'updated_at': now
+                })
+            
+            try:
+                # Files that failed extraction earlier but were read this time
+                if features_rows:
+                    ResumeFeatures.query.filter(
+                        ResumeFeatures.file_hash.in_([row['file_hash'] for row in features_rows]),
+                        ResumeFeatures.extraction_error.isnot(None)
+                    ).delete(synchronize_session=False)
+                db.session.bulk_insert_mappings(ResumeFeatures, features_rows)
+                db.session.bulk_insert_mappings(User, user_rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            
+            stats['imported'] += len(user_rows)
+            stats['seconds'] = time.perf_counter() - started
+            if report:
+                report(dict(stats))
+        
+        batch = []
+        try:
+            for name, read in ImportService.iter_resume_files(source):
+                stats['seen'] += 1
+                data = read()
+                file_hash = hashlib.sha256(data).hexdigest()
+                if file_hash in imported_hashes:
+                    stats['skipped'] += 1
+                    continue
+                imported_hashes.add(file_hash)
+                
+                # Named after the content, so a rerun rewrites the same file
+                path = os.path.join(upload_folder, f'{file_hash[:16]}_{secure_filename(os.path.basename(name))}')
+                with open(path, 'wb') as f:
+                    f.write(data)
+                stats['bytes'] += len(data)
+                
+                batch.append({'name': name, 'hash': file_hash, 'path': path})
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+        finally:
+            pool.close()
+            if executor is not None:
+                executor.shutdown()
+        
+        stats['seconds'] = time.perf_counter() - started
+        return stats
@@ -0,0 +1,234 @@
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_
+from ..models.job import JobOffer
+from ..models.resume_ingestion import ResumeIngestion
+from ..models.scoring_task import ScoringTask
+from ..models.user import User
+from .. import db
+
+class IngestionService:
+    """Service for the background resume processing and scoring queues.
+    
+    Uploads only enqueue a row in resume_ingestions, and job changes a
+    row in scoring_tasks; worker threads or processes claim rows, run text
+    extraction, feature computation and score precomputation, and record
+    the outcome on the row. Requests only read stored scores.
+    """
+    
+    @staticmethod
+    def enqueue(candidate_id, file_path, commit=True):
+        """Queue an uploaded resume for processing."""
+        ingestion = ResumeIngestion(candidate_id=candidate_id, file_path=file_path, status='pending')
+        db.session.add(ingestion)
+        if commit:
+            try:
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+        return ingestion
+    
+    @staticmethod
+    def enqueue_scoring(job_id=None, candidate_id=None, commit=True):
+        """Queue the rescoring of a job or of a candidate.
+        
+        A task still pending for the same job or candidate is reused.
+        """
+        task = ScoringTask.query.filter_by(job_id=job_id, candidate_id=candidate_id, status='pending').first()
+        if task is None:
+            task = ScoringTask(job_id=job_id, candidate_id=candidate_id, status='pending')
+            db.session.add(task)
+        if commit:
+            try:
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+        return task
+    
+    @staticmethod
+    def enqueue_all_scoring(candidates=False, batch_size=1000):
+        """Queue the rescoring of every active job, and optionally every candidate.
+        
+        Jobs and candidates that already have a pending task are skipped.
+        Returns the number of tasks queued.
+        """
+        pending = ScoringTask.query.filter_by(status='pending').with_entities(
+            ScoringTask.job_id, ScoringTask.candidate_id
+        ).all()
+        targets = [
+            {'job_id': job_id, 'candidate_id': None}
+            for job_id, in JobOffer.query.filter_by(is_active=True).with_entities(JobOffer.id)
+            if (job_id, None) not in pending
+        ]
+        if candidates:
+            targets.extend(
+                {'job_id': None, 'candidate_id': candidate_id}
+                for candidate_id, in User.query.filter(User.resume_hash.isnot(None)).with_entities(User.id)
+                if (None, candidate_id) not in pending
+            )
+        
+        now = datetime.utcnow()
+        try:
+            for start in range(0, len(targets), batch_size):
+                db.session.bulk_insert_mappings(ScoringTask, [
+                    dict(target, status='pending', attempts=0, created_at=now)
+                    for target in targets[start:start + batch_size]
+                ])
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return len(targets)
+    
+    @staticmethod
+    def get_status(candidate_id):
+        """Get the most recent ingestion of a candidate's resume, if any."""
+        return ResumeIngestion.query.filter_by(candidate_id=candidate_id).order_by(
+            ResumeIngestion.id.desc()
+        ).first()
+    
+    @staticmethod
+    def _claimable(model):
+        # Rows left in processing by a worker that died are claimed again
+        stale_before = datetime.utcnow() - timedelta(
+            seconds=current_app.config.get('INGESTION_TIMEOUT_SECONDS', 600)
+        )
+        return or_(
+            model.status == 'pending',
+            and_(model.status == 'processing', model.started_at < stale_before)
+        )
+    
+    @staticmethod
+    def claim(worker_id, model=ResumeIngestion):
+        """Atomically claim the oldest claimable row of a queue, or return None."""
+        while True:
+            row = model.query.filter(IngestionService._claimable(model)).order_by(
+                model.id
+            ).with_entities(model.id).first()
+            if row is None:
+                db.session.rollback()
+                return None
+            
+            # Only one worker's conditional update can match the row
+            claimed = model.query.filter(
+                model.id == row.id,
+                IngestionService._claimable(model)
+            ).update({
+                'status': 'processing',
+                'worker_id': worker_id,
+                'started_at': datetime.utcnow(),
+                'attempts': model.attempts + 1
+            }, synchronize_session=False)
+            db.session.commit()
+            if claimed:
+                return model.query.get(row.id)
+    
+    @staticmethod
+    def _finish(row, success, message):
+        """Record the outcome of a processed row; failures are retried."""
+        if success:
+            row.status = 'done'
+            row.error = None
+        else:
+            max_attempts = current_app.config.get('INGESTION_MAX_ATTEMPTS', 3)
+            row.status = 'failed' if row.attempts >= max_attempts else 'pending'
+            row.error = message
+        
+        row.finished_at = datetime.utcnow()
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return row.status
+    
+    @staticmethod
+    def process(ingestion):
+        """Process a claimed ingestion and record its outcome."""
+        from .cv_matching_service import CVMatchingService
+        
+        user = User.query.get(ingestion.candidate_id)
+        if user is None or user.resume_path != ingestion.file_path:
+            # A newer upload replaced this resume before it was processed
+            ingestion.status = 'superseded'
+            ingestion.finished_at = datetime.utcnow()
+            try:
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            return ingestion.status
+        
+        success, message = CVMatchingService.process_resume(ingestion.candidate_id, ingestion.file_path)
+        return IngestionService._finish(ingestion, success, message)
+    
+    @staticmethod
+    def process_scoring(task):
+        """Process a claimed scoring task and record its outcome."""
+        from .cv_matching_service import CVMatchingService
+        
+        if task.job_id is not None:
+            job = JobOffer.query.get(task.job_id)
+            success, message = CVMatchingService().update_job_features(job) if job else (True, 'Job deleted')
+        else:
+            success, message = CVMatchingService.rescore_candidate(task.candidate_id)
+        return IngestionService._finish(task, success, message)
+    
+    @staticmethod
+    def run_worker(app, worker_id=None, stop_event=None, max_idle=None):
+        """Claim and process ingestions and scoring tasks until stopped.
+        
+        Resume ingestions, which a candidate is waiting for, come first.
+        
+        Returns after `max_idle` seconds without work if given, which lets
+        batch runs drain the queue and exit.
+        """
+        worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+        stop_event = stop_event or threading.Event()
+        idle_since = time.monotonic()
+        
+        with app.app_context():
+            poll_interval = app.config.get('INGESTION_POLL_SECONDS', 1.0)
+            while not stop_event.is_set():
+                try:
+                    ingestion = IngestionService.claim(worker_id)
+                    if ingestion is not None:
+                        status = IngestionService.process(ingestion)
+                        app.logger.info('Resume ingestion %d: %s', ingestion.id, status)
+                        idle_since = time.monotonic()
+                        continue
+                    
+                    task = IngestionService.claim(worker_id, ScoringTask)
+                    if task is not None:
+                        status = IngestionService.process_scoring(task)
+                        app.logger.info('Scoring task %d: %s', task.id, status)
+                        idle_since = time.monotonic()
+                        continue
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Resume ingestion worker %s failed', worker_id)
+                finally:
+                    db.session.remove()
+                
+                if max_idle is not None and time.monotonic() - idle_since >= max_idle:
+                    return
+                stop_event.wait(poll_interval)
+    
+    @staticmethod
+    def start_threads(app, count):
+        """Start daemon worker threads inside the current process."""
+        threads = []
+        for i in range(count):
+            thread = threading.Thread(
+                target=IngestionService.run_worker, args=(app,),
+                name=f'resume-ingestion-{i}', daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+        return threads
@@ -0,0 +1,173 @@
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from ..models.job import JobOffer
+from .feature_store_service import FeatureStoreService
+from .. import db
+
+class JobFeedService:
+    """Service for bulk importing and exporting job offers as CSV or JSONL feeds."""
+    
+    # Feed fields copied onto JobOffer columns
+    FIELDS = ('title', 'description', 'requirements', 'location', 'salary_range', 'job_type')
+    EXPORT_FIELDS = ('external_id',) + FIELDS + ('is_active', 'created_at', 'updated_at')
+    
+    @staticmethod
+    def detect_format(path):
+        """Guess the feed format from the file extension."""
+        extension = os.path.splitext(path)[1].lower()
+        return 'jsonl' if extension in ('.jsonl', '.ndjson', '.json') else 'csv'
+    
+    @staticmethod
+    def iter_feed(path, fmt=None):
+        """Stream the records of a CSV or JSONL job feed one at a time."""
+        fmt = fmt or JobFeedService.detect_format(path)
+        with open(path, newline='', encoding='utf-8') as f:
+            if fmt == 'csv':
+                yield from csv.DictReader(f)
+            else:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+    
+    @staticmethod
+    def _parse_active(value):
+        if value is None or value == '':
+            return True
+        if isinstance(value, bool):
+            return value
+        return str(value).strip().lower() in ('1', 'true', 'yes', 'active')
+    
+    @staticmethod
+    def _apply(job, record):
+        """Copy feed values onto a job; returns whether anything changed."""
+        changed = False
+        values = {field: record.get(field) or None for field in JobFeedService.FIELDS}
+        values['is_active'] = JobFeedService._parse_active(record.get('is_active'))
+        for field, value in values.items():
+            if getattr(job, field) != value:
+                setattr(job, field, value)
+                changed = True
+        return changed
+    
+    @staticmethod
+    def import_jobs(path, cv_matcher, creator_id=None, fmt=None, batch_size=1000,
+                    executor=None, deactivate_missing=False, report=None):
+        """Upsert the jobs of a feed by external id.
+        
+        Records are streamed and handled `batch_size` at a time: existing
+        jobs are loaded with one query per batch, only new or changed rows
+        are written, features are recomputed for jobs whose matching text
+        changed, and each batch is committed once. With
+        `deactivate_missing`, feed jobs of `creator_id` absent from this
+        feed are deactivated. Records without an external id, title or
+        description are counted as invalid.
+        
+        `report` is called with a stats dict after each batch. Returns the
+        final stats.
+        """
+        stats = {'seen': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0,
+                 'features': 0, 'deactivated': 0, 'seconds': 0.0}
+        started = time.perf_counter()
+        seen_ids = set()
+        
+        def flush(batch):
+            existing = {
+                job.external_id: job
+                for job in JobOffer.query.filter(JobOffer.external_id.in_(list(batch))).all()
+            }
+            changed_jobs = []
+            for external_id, record in batch.items():
+                job = existing.get(external_id)
+                if job is None:
+                    job = JobOffer(external_id=external_id, creator_id=creator_id)
+                    JobFeedService._apply(job, record)
+                    db.session.add(job)
+                    stats['created'] += 1
+                elif JobFeedService._apply(job, record):
+                    stats['updated'] += 1
+                else:
+                    stats['unchanged'] += 1
+                    continue
+                changed_jobs.append(job)
+            
+            try:
+                # Assigns ids to new jobs before their features are stored
+                db.session.flush()
+                stats['features'] += FeatureStoreService.update_job_features(
+                    [job for job in changed_jobs if job.is_active],
+                    cv_matcher, commit=False, executor=executor
+                )
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            
+            stats['seconds'] = time.perf_counter() - started
+            if report:
+                report(dict(stats))
+        
+        batch = {}
+        for record in JobFeedService.iter_feed(path, fmt):
+            stats['seen'] += 1
+            external_id = str(record.get('external_id') or '').strip()
+            if not external_id or not record.get('title') or not record.get('description'):
+                stats['invalid'] += 1
+                continue
+            
+            # A later record for the same id in the feed wins
+            batch[external_id] = record
+            seen_ids.add(external_id)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = {}
+        if batch:
+            flush(batch)
+        
+        if deactivate_missing:
+            missing = [
+                job_id for job_id, external_id in JobOffer.query.filter(
+                    JobOffer.creator_id == creator_id,
+                    JobOffer.external_id.isnot(None),
+                    JobOffer.is_active.is_(True)
+                ).with_entities(JobOffer.id, JobOffer.external_id)
+                if external_id not in seen_ids
+            ]
+            for start in range(0, len(missing), batch_size):
+                JobOffer.query.filter(JobOffer.id.in_(missing[start:start + batch_size])).update(
+                    {'is_active': False, 'updated_at': datetime.utcnow()}, synchronize_session=False
+                )
+            db.session.commit()
+            stats['deactivated'] = len(missing)
+        
+        stats['seconds'] = time.perf_counter() - started
+        return stats
+    
+    @staticmethod
+    def export_jobs(out, fmt='csv', active_only=False, batch_size=1000):
+        """Stream job offers to a file object as CSV or JSONL.
+        
+        Returns the number of jobs written.
+        """
+        query = JobOffer.query.order_by(JobOffer.id)
+        if active_only:
+            query = query.filter(JobOffer.is_active.is_(True))
+        
+        writer = None
+        if fmt == 'csv':
+            writer = csv.DictWriter(out, fieldnames=JobFeedService.EXPORT_FIELDS)
+            writer.writeheader()
+        
+        count = 0
+        for job in query.yield_per(batch_size):
+            row = {field: getattr(job, field) for field in JobFeedService.EXPORT_FIELDS}
+            for field in ('created_at', 'updated_at'):
+                row[field] = row[field].isoformat() if row[field] else None
+            if writer is not None:
+                writer.writerow(row)
+            else:
+                out.write(json.dumps(row, ensure_ascii=False) + '\n')
+            count += 1
+        return count
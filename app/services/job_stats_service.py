@@ -0,0 +1,60 @@
+from datetime import datetime
+from sqlalchemy import case, func
+from ..models.application import Application
+from ..models.job import JobOffer
+from ..models.job_stats import COUNTED_STATUSES, JobApplicationStats
+from .. import db
+
+class JobStatsService:
+    """Service for the denormalized per-job application counters."""
+    
+    @staticmethod
+    def get_recruiter_jobs(recruiter_id):
+        """Get a recruiter's jobs with their counters in a single query.
+        
+        Returns (job, stats) pairs, newest job first; stats is None for a
+        job whose counters row has not been created yet.
+        """
+        return db.session.query(JobOffer, JobApplicationStats).outerjoin(
+            JobApplicationStats, JobApplicationStats.job_id == JobOffer.id
+        ).filter(
+            JobOffer.creator_id == recruiter_id
+        ).order_by(JobOffer.created_at.desc()).all()
+    
+    @staticmethod
+    def rebuild():
+        """Recompute every job's counters from the applications table.
+        
+        Returns the number of jobs whose counters were rebuilt.
+        """
+        status = func.lower(Application.status)
+        aggregates = db.session.query(
+            Application.job_id,
+            func.count(Application.id),
+            func.coalesce(func.sum(Application.match_percentage), 0.0),
+            func.count(Application.match_percentage),
+            func.max(Application.match_percentage),
+            *[func.sum(case((status == name, 1), else_=0)) for name in COUNTED_STATUSES]
+        ).filter(Application.job_id.isnot(None)).group_by(Application.job_id)
+        
+        now = datetime.utcnow()
+        rows = {
+            job_id: {'job_id': job_id, 'updated_at': now}
+            for job_id, in JobOffer.query.with_entities(JobOffer.id)
+        }
+        for job_id, total, score_sum, scored_count, max_score, *counts in aggregates:
+            row = rows.setdefault(job_id, {'job_id': job_id, 'updated_at': now})
+            row.update(
+                applications_count=total, score_sum=score_sum,
+                scored_count=scored_count, max_score=max_score
+            )
+            row.update({f'{name}_count': count for name, count in zip(COUNTED_STATUSES, counts)})
+        
+        try:
+            JobApplicationStats.query.delete(synchronize_session=False)
+            db.session.bulk_insert_mappings(JobApplicationStats, list(rows.values()))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return len(rows)
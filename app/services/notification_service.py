@@ -1,9 +1,23 @@
+from datetime import datetime
+from sqlalchemy import case, func, select, tuple_
 from ..models.notification import Notification
 from ..models.user import User
 from .. import db
 
 class NotificationService:
-    """Service for notification operations."""
+    """Service for notification operations.
+    
+    Every notification write goes through this service, which keeps
+    users.unread_notifications in step in the same transaction.
+    """
+    
+    @staticmethod
+    def _add_unread(user_ids, delta):
+        """Add `delta` to the unread counters of users, never below zero."""
+        users = User.__table__
+        counter = users.c.unread_notifications
+        value = counter + delta if delta > 0 else case((counter > -delta, counter + delta), else_=0)
+        db.session.execute(users.update().where(users.c.id.in_(list(user_ids))).values(unread_notifications=value))
     
     @staticmethod
     def create_notification(user_id, message, link=None):
@@ -23,12 +37,51 @@ class NotificationService:
         try:
             # Save to database
             db.session.add(notification)
+            NotificationService._add_unread([user_id], 1)
             db.session.commit()
             return True, "Notification created successfully"
         except Exception as e:
             db.session.rollback()
             return False, f"Error creating notification: {str(e)}"
     
+    @staticmethod
+    def create_notifications(user_ids, message, link=None, commit=True, batch_size=1000):
+        """Create the same notification for many users at once.
+        
+        Rows are written with executemany INSERTs of `batch_size` rows, each
+        followed by one UPDATE of the users' unread counters, and committed
+        once, so notifying thousands of users is a single
+        transaction. User ids are not checked; duplicates are notified
+        once. Returns (success, message, count).
+        """
+        now = datetime.utcnow()
+        table = Notification.__table__
+        count = 0
+        
+        def write(user_batch):
+            db.session.execute(table.insert(), [
+                {'user_id': user_id, 'message': message, 'link': link, 'is_read': False, 'created_at': now}
+                for user_id in user_batch
+            ])
+            NotificationService._add_unread(user_batch, 1)
+            return len(user_batch)
+        
+        try:
+            batch = []
+            for user_id in dict.fromkeys(user_ids):
+                batch.append(user_id)
+                if len(batch) >= batch_size:
+                    count += write(batch)
+                    batch = []
+            if batch:
+                count += write(batch)
+            if commit:
+                db.session.commit()
+            return True, f"{count} notifications created", count
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error creating notifications: {str(e)}", 0
+    
     @staticmethod
     def get_user_notifications(user_id, include_read=False):
         """Get notifications for a user."""
@@ -39,6 +92,40 @@ class NotificationService:
         
         return query.order_by(Notification.created_at.desc()).all()
     
+    @staticmethod
+    def get_feed(user_id, unread_only=False, before=None, limit=20):
+        """Get one page of a user's notifications, newest first.
+        
+        `before` is the cursor of the last notification of the previous
+        page; pages are read by keyset on (created_at, id) so that every
+        page costs the same. Returns (notifications, next_cursor).
+        """
+        limit = max(1, limit)
+        query = Notification.query.filter(Notification.user_id == user_id)
+        if unread_only:
+            query = query.filter(Notification.is_read.is_(False))
+        
+        if before:
+            try:
+                created_at, notification_id = before.rsplit('_', 1)
+                position = (datetime.fromisoformat(created_at), int(notification_id))
+            except ValueError:
+                position = None
+            if position is not None:
+                query = query.filter(tuple_(Notification.created_at, Notification.id) < position)
+        
+        # One extra row tells whether there is a next page
+        notifications = query.order_by(
+            Notification.created_at.desc(), Notification.id.desc()
+        ).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(notifications) > limit:
+            notifications = notifications[:limit]
+            last = notifications[-1]
+            next_cursor = f'{last.created_at.isoformat()}_{last.id}'
+        return notifications, next_cursor
+    
     @staticmethod
     def mark_notification_as_read(notification_id):
         """Mark a notification as read."""
@@ -47,26 +134,56 @@ class NotificationService:
         if not notification:
             return False, "Notification not found"
         
-        notification.is_read = True
-        
+        return NotificationService.mark_as_read(notification.user_id, [notification_id])
+    
+    @staticmethod
+    def mark_as_read(user_id, notification_ids):
+        """Mark several of a user's notifications as read with one UPDATE."""
         try:
+            count = Notification.query.filter(
+                Notification.user_id == user_id,
+                Notification.id.in_(list(notification_ids)),
+                Notification.is_read.is_(False)
+            ).update({'is_read': True}, synchronize_session=False)
+            if count:
+                NotificationService._add_unread([user_id], -count)
             db.session.commit()
-            return True, "Notification marked as read"
+            return True, f"{count} notifications marked as read"
         except Exception as e:
             db.session.rollback()
-            return False, f"Error marking notification as read: {str(e)}"
+            return False, f"Error marking notifications as read: {str(e)}"
     
     @staticmethod
     def mark_all_as_read(user_id):
         """Mark all user notifications as read."""
         try:
-            Notification.query.filter_by(user_id=user_id, is_read=False).update({"is_read": True})
+            count = Notification.query.filter_by(user_id=user_id, is_read=False).update(
+                {'is_read': True}, synchronize_session=False
+            )
+            if count:
+                NotificationService._add_unread([user_id], -count)
             db.session.commit()
             return True, "All notifications marked as read"
         except Exception as e:
             db.session.rollback()
             return False, f"Error marking notifications as read: {str(e)}"
     
+    @staticmethod
+    def rebuild_unread_counts():
+        """Recompute every user's unread counter from the notifications table."""
+        users = User.__table__
+        unread = select(func.count(Notification.id)).where(
+            Notification.user_id == users.c.id,
+            Notification.is_read.is_(False)
+        ).scalar_subquery()
+        try:
+            count = db.session.execute(users.update().values(unread_notifications=unread)).rowcount
+            db.session.commit()
+            return count
+        except Exception:
+            db.session.rollback()
+            raise
+    
     @staticmethod
     def notify_application_status_change(application_id, new_status):
         """Create notification for application status change."""
@@ -119,4 +236,22 @@ class NotificationService:
             application.job.creator_id,
             message,
             link
+        )
+    
+    @staticmethod
+    def notify_job_closed(job, commit=True):
+        """Notify every candidate who applied to a job that it was closed."""
+        from ..models.application import Application
+        
+        applicant_ids = [
+            applicant_id for applicant_id, in Application.query.filter(
+                Application.job_id == job.id,
+                Application.applicant_id.isnot(None)
+            ).with_entities(Application.applicant_id).distinct()
+        ]
+        return NotificationService.create_notifications(
+            applicant_ids,
+            f"The job '{job.title}' you applied for has been closed",
+            "/applications",
+            commit=commit
         )
\ No newline at end of file
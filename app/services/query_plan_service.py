@@ -0,0 +1,117 @@
+from datetime import datetime
+from sqlalchemy import tuple_
+from ..models.application import Application
+from ..models.job import JobOffer
+from ..models.job_stats import JobApplicationStats
+from ..models.match_score import MatchScore
+from ..models.notification import Notification
+from ..models.resume_features import ResumeFeatures
+from ..models.user import User
+from .. import db
+
+class QueryPlanService:
+    """Service for checking that the hot queries are served by indexes.
+    
+    The statements below mirror the queries behind the dashboards, feeds
+    and scoring paths with placeholder values. Run `flask check-query-plans`
+    after schema or query changes; it fails when one of them scans a
+    whole table or sorts rows instead of reading an index in order.
+    """
+    
+    @staticmethod
+    def hot_queries():
+        """Get (name, statement) pairs of the queries to check."""
+        now = datetime.utcnow()
+        return [
+            ('applications page by score', Application.query.filter(
+                Application.job_id == 1,
+                Application.match_percentage.isnot(None),
+                tuple_(Application.match_percentage, Application.id) < (50.0, 1000)
+            ).order_by(Application.match_percentage.desc(), Application.id.desc()).limit(26)),
+            ('applications of a candidate', Application.query.filter(Application.applicant_id == 1)),
+            ('existing application', Application.query.filter_by(applicant_id=1, job_id=1).limit(1)),
+            ('recruiter dashboard', db.session.query(JobOffer, JobApplicationStats).outerjoin(
+                JobApplicationStats, JobApplicationStats.job_id == JobOffer.id
+            ).filter(JobOffer.creator_id == 1).order_by(JobOffer.created_at.desc())),
+            ('active job listing', JobOffer.query.filter(
+                JobOffer.is_active.is_(True),
+                JobOffer.id.notin_([1, 2]),
+                tuple_(JobOffer.created_at, JobOffer.id) < (now, 1000)
+            ).order_by(JobOffer.created_at.desc(), JobOffer.id.desc()).limit(21)),
+            ('notification feed', Notification.query.filter(
+                Notification.user_id == 1,
+                tuple_(Notification.created_at, Notification.id) < (now, 1000)
+            ).order_by(Notification.created_at.desc(), Notification.id.desc()).limit(21)),
+            ('unread notification feed', Notification.query.filter(
+                Notification.user_id == 1,
+                Notification.is_read.is_(False)
+            ).order_by(Notification.created_at.desc(), Notification.id.desc()).limit(21)),
+            ('match scores of a job', MatchScore.query.join(User, User.id == MatchScore.candidate_id).filter(
+                MatchScore.job_id == 1,
+                MatchScore.model_version == 'v',
+                MatchScore.resume_hash == User.resume_hash
+            )),
+            ('match scores of a candidate', MatchScore.query.filter(
+                MatchScore.candidate_id == 1,
+                MatchScore.model_version == 'v',
+                MatchScore.resume_hash == '0' * 64,
+                MatchScore.job_id.in_([1, 2])
+            )),
+            ('top matches of a job', db.session.query(User, MatchScore.score).join(
+                MatchScore, MatchScore.candidate_id == User.id
+            ).filter(
+                MatchScore.job_id == 1,
+                MatchScore.model_version == 'v',
+                MatchScore.resume_hash == User.resume_hash
+            ).order_by(MatchScore.score.desc()).limit(50)),
+            ('top matches of a candidate', db.session.query(JobOffer, MatchScore.score).join(
+                MatchScore, MatchScore.job_id == JobOffer.id
+            ).filter(
+                MatchScore.candidate_id == 1,
+                MatchScore.model_version == 'v',
+                MatchScore.resume_hash == '0' * 64,
+                JobOffer.is_active.is_(True)
+            ).order_by(MatchScore.score.desc()).limit(50)),
+            ('resume features by hash', ResumeFeatures.query.filter_by(file_hash='0' * 64).limit(1)),
+            ('candidates by resume hash', User.query.filter(User.resume_hash == '0' * 64)),
+        ]
+    
+    @staticmethod
+    def explain(query):
+        """Get the plan lines of a query on the current database."""
+        statement = getattr(query, 'statement', query)
+        connection = db.session.connection()
+        compiled = statement.compile(
+            dialect=connection.dialect, compile_kwargs={'render_postcompile': True}
+        )
+        params = compiled.params
+        if compiled.positional:
+            params = tuple(params[name] for name in compiled.positiontup)
+        
+        if connection.dialect.name == 'sqlite':
+            rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params)
+        else:
+            # Small tables are cheaper to scan; ask for the index plan anyway
+            connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+            rows = connection.exec_driver_sql(f'EXPLAIN {compiled}', params)
+        return [row[-1] for row in rows]
+    
+    @staticmethod
+    def problems(plan):
+        """Get the plan lines that read a whole table or sort rows."""
+        return [
+            line for line in plan
+            if line.lstrip().startswith(('SCAN ', 'USE TEMP B-TREE')) or 'Seq Scan' in line
+        ]
+    
+    @staticmethod
+    def check():
+        """Explain every hot query; returns (name, plan, problems) triples."""
+        results = []
+        try:
+            for name, query in QueryPlanService.hot_queries():
+                plan = QueryPlanService.explain(query)
+                results.append((name, plan, QueryPlanService.problems(plan)))
+        finally:
+            db.session.rollback()
+        return results
@@ -0,0 +1,301 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_
+from ..models.job import JobOffer
+from ..models.job_features import JobFeatures
+from ..models.resume_features import ResumeFeatures
+from ..models.resume_ingestion import ResumeIngestion
+from ..models.user import User
+from .feature_store_service import FeatureStoreService
+from .. import db
+
+# Rows are written with their timestamp before the transaction commits, so
+# each refresh looks back a little further than the previous query started.
+_WATERMARK_SLACK = timedelta(seconds=60)
+
+class _IndexState:
+    """A process-wide index and the markers used to keep it fresh."""
+    
+    def __init__(self, name):
+        self.name = name
+        self.index = None
+        self.version = None
+        self.watermark = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+_job_index = _IndexState('job')
+_candidate_index = _IndexState('candidate')
+
+class RetrievalService:
+    """Service for first-stage retrieval over stored TF-IDF vectors.
+    
+    Two indexes are kept per process: active jobs, searched with a
+    candidate's resume, and candidates' current resumes, searched with a
+    job. Both are built from the feature tables on first use and kept up
+    to date incrementally.
+    """
+    
+    @staticmethod
+    def _stack_vectors(rows, n_features):
+        """Build ids and a CSR matrix from (id, indices, values) rows."""
+        import numpy as np
+        from scipy import sparse
+        
+        ids, indices, values, indptr = [], [], [], [0]
+        for item_id, row_indices, row_values in rows:
+            ids.append(item_id)
+            indices.append(np.frombuffer(row_indices, dtype=np.int32))
+            values.append(np.frombuffer(row_values, dtype=np.float64))
+            indptr.append(indptr[-1] + len(indices[-1]))
+        
+        matrix = sparse.csr_matrix(
+            (
+                np.concatenate(values) if values else np.zeros(0),
+                np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+                np.array(indptr)
+            ),
+            shape=(len(ids), n_features)
+        )
+        return ids, matrix
+    
+    @staticmethod
+    def _job_rows(version, since=None):
+        """Yield (job id, indices, values) of indexable jobs, or of changed jobs.
+        
+        With `since`, changed jobs that should leave the index are yielded
+        with None vectors.
+        """
+        query = JobFeatures.query.join(JobOffer, JobOffer.id == JobFeatures.job_id).filter(
+            JobFeatures.extractor_version == version,
+            JobFeatures.tfidf_indices.isnot(None)
+        )
+        if since is None:
+            query = query.filter(JobOffer.is_active.is_(True))
+        else:
+            query = query.filter(or_(JobFeatures.updated_at >= since, JobOffer.updated_at >= since))
+        
+        for job_id, indices, values, is_active in query.with_entities(
+            JobFeatures.job_id, JobFeatures.tfidf_indices, JobFeatures.tfidf_values, JobOffer.is_active
+        ):
+            if is_active:
+                yield job_id, indices, values
+            else:
+                yield job_id, None, None
+    
+    @staticmethod
+    def _candidate_rows(version, since=None, user_ids=None):
+        """Query (user id, indices, values) of indexable candidates, or of changed candidates.
+        
+        With `since` or `user_ids`, candidates whose current resume has no
+        vector yet are included with None vectors, so that a replaced
+        resume leaves the index.
+        """
+        query = User.query.outerjoin(ResumeFeatures, and_(
+            ResumeFeatures.file_hash == User.resume_hash,
+            ResumeFeatures.extractor_version == version
+        )).filter(User.role == 'candidate')
+        if user_ids is not None:
+            query = query.filter(User.id.in_(user_ids))
+        elif since is not None:
+            query = query.filter(or_(User.updated_at >= since, ResumeFeatures.updated_at >= since))
+        else:
+            query = query.filter(ResumeFeatures.tfidf_indices.isnot(None))
+        
+        return query.with_entities(User.id, ResumeFeatures.tfidf_indices, ResumeFeatures.tfidf_values)
+    
+    @staticmethod
+    def _batches(query, model, batch_size):
+        """Yield the rows of a query in batches of `batch_size`, keyed on id.
+        
+        Each batch is a fresh query, so callers can commit between batches.
+        """
+        last_id = 0
+        while True:
+            batch = query.filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1].id
+    
+    @staticmethod
+    def prepare_jobs(cv_matcher, batch_size=500):
+        """Make sure every active job has vectors from the current extractor.
+        
+        Run offline with `flask prepare-features`, like `prepare_candidates`.
+        Returns the number of jobs whose features were recomputed.
+        """
+        recomputed = 0
+        for batch in RetrievalService._batches(
+            JobOffer.query.filter_by(is_active=True), JobOffer, batch_size
+        ):
+            recomputed += FeatureStoreService.update_job_features(batch, cv_matcher)
+        return recomputed
+    
+    @staticmethod
+    def prepare_candidates(cv_matcher, batch_size=500):
+        """Make sure every candidate resume has vectors from the current extractor.
+        
+        Run offline with `flask prepare-features`, e.g. after a model
+        change; the candidate index only reads vectors that already exist.
+        Returns the number of hashes backfilled and of records recomputed.
+        """
+        # Resumes processed before users.resume_hash existed; queued uploads
+        # get their hash from the ingestion worker
+        queued = db.session.query(ResumeIngestion.candidate_id).filter(
+            ResumeIngestion.status.in_(('pending', 'processing'))
+        )
+        hashed = 0
+        for batch in RetrievalService._batches(User.query.filter(
+            User.role == 'candidate',
+            User.resume_path.isnot(None),
+            User.resume_hash.is_(None),
+            User.id.notin_(queued)
+        ), User, batch_size):
+            for user in batch:
+                if os.path.exists(user.resume_path):
+                    user.resume_hash = FeatureStoreService.hash_file(user.resume_path)
+                    hashed += 1
+            FeatureStoreService._commit()
+        
+        version = cv_matcher.features_version
+        current = db.session.query(User.resume_hash).filter(
+            User.role == 'candidate',
+            User.resume_hash.isnot(None)
+        )
+        recomputed = 0
+        for batch in RetrievalService._batches(ResumeFeatures.query.filter(
+            ResumeFeatures.file_hash.in_(current),
+            ResumeFeatures.extraction_error.is_(None),
+            or_(ResumeFeatures.extractor_version != version, ResumeFeatures.extractor_version.is_(None))
+        ), ResumeFeatures, batch_size):
+            recomputed += FeatureStoreService.update_resume_features(batch, cv_matcher)
+        
+        return hashed, recomputed
+    
+    @staticmethod
+    def _apply_rows(state, rows):
+        """Upsert or remove index entries from (id, indices, values) rows."""
+        for item_id, indices, values in rows:
+            if indices is None:
+                state.index.remove(item_id)
+            else:
+                _, vector = RetrievalService._stack_vectors(
+                    [(item_id, indices, values)], state.index.n_features
+                )
+                state.index.upsert(item_id, vector)
+    
+    @staticmethod
+    def _get_index(state, cv_matcher, rows):
+        """Get an index, building or refreshing it as needed.
+        
+        Returns None when no vectorizer is fitted, since there are no
+        vectors to search then.
+        """
+        from ..ai.retrieval_index import SparseVectorIndex
+        
+        version = cv_matcher.features_version
+        if version is None:
+            return None
+        
+        with state.lock:
+            if state.index is None or state.version != version:
+                started = datetime.utcnow()
+                ids, matrix = RetrievalService._stack_vectors(
+                    rows(version), len(cv_matcher.feature_extractor.tfidf_vectorizer.vocabulary_)
+                )
+                state.index = SparseVectorIndex.build(ids, matrix)
+                state.version = version
+                current_app.logger.info('Built %s retrieval index with %d entries', state.name, len(ids))
+            elif time.monotonic() - state.checked_at >= current_app.config.get('RETRIEVAL_REFRESH_SECONDS', 30):
+                # Picks up changes committed by other worker processes
+                started = datetime.utcnow()
+                RetrievalService._apply_rows(state, rows(version, since=state.watermark))
+            else:
+                return state.index
+            
+            state.watermark = started - _WATERMARK_SLACK
+            state.checked_at = time.monotonic()
+            return state.index
+    
+    @staticmethod
+    def get_job_index(cv_matcher):
+        """Get the process-wide index of active jobs.
+        
+        Only jobs featurized by the current extractor are indexed, see
+        `prepare_jobs`.
+        """
+        return RetrievalService._get_index(
+            _job_index, cv_matcher, RetrievalService._job_rows
+        )
+    
+    @staticmethod
+    def get_candidate_index(cv_matcher):
+        """Get the process-wide index of candidates' current resumes.
+        
+        Only resumes featurized by the current extractor are indexed, see
+        `prepare_candidates`.
+        """
+        return RetrievalService._get_index(
+            _candidate_index, cv_matcher, RetrievalService._candidate_rows
+        )
+    
+    @staticmethod
+    def index_jobs(jobs, cv_matcher):
+        """Update the job index in place after jobs were saved by this process."""
+        version = cv_matcher.features_version
+        with _job_index.lock:
+            if _job_index.index is None or _job_index.version != version:
+                return
+            
+            for job in jobs:
+                record = job.features
+                vector = None
+                if job.is_active and record is not None and record.extractor_version == version:
+                    vector = FeatureStoreService._load_features(record)['tfidf']
+                
+                if vector is not None:
+                    _job_index.index.upsert(job.id, vector)
+                else:
+                    _job_index.index.remove(job.id)
+    
+    @staticmethod
+    def index_candidates(users, cv_matcher):
+        """Update the candidate index in place after resumes were saved by this process."""
+        version = cv_matcher.features_version
+        with _candidate_index.lock:
+            if _candidate_index.index is None or _candidate_index.version != version:
+                return
+            
+            RetrievalService._apply_rows(_candidate_index, RetrievalService._candidate_rows(
+                version, user_ids=[user.id for user in users]
+            ))
+    
+    @staticmethod
+    def _search(index, state, features, k):
+        vector = features.get('tfidf')
+        if index is None or vector is None or features.get('extractor_version') != state.version:
+            return None
+        return index.search(vector, k)
+    
+    @staticmethod
+    def search_jobs(resume_features, cv_matcher, k):
+        """Get the ids and cosine similarities of the k jobs closest to a resume.
+        
+        Returns None when retrieval is unavailable, in which case callers
+        should fall back to scoring every active job.
+        """
+        index = RetrievalService.get_job_index(cv_matcher)
+        return RetrievalService._search(index, _job_index, resume_features, k)
+    
+    @staticmethod
+    def search_candidates(job_features, cv_matcher, k):
+        """Get the ids and cosine similarities of the k candidates closest to a job.
+        
+        Returns None when retrieval is unavailable.
+        """
+        index = RetrievalService.get_candidate_index(cv_matcher)
+        return RetrievalService._search(index, _candidate_index, job_features, k)
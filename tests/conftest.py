@@ -0,0 +1,37 @@
+import pytest
+from app import create_app, db
+from app.models.user import User
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def nlp():
+    """Skip tests that run the text pipeline when NLTK data is missing."""
+    from app.ai.text_processor import get_token_cache
+    try:
+        get_token_cache()
+    except LookupError as e:
+        pytest.skip(str(e))
+
+def create_user(username, role, **fields):
+    user = User(username=username, email=f'{username}@example.com', role=role, **fields)
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+def login(client, user):
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+        session['_fresh'] = True
@@ -0,0 +1,114 @@
+from app import db
+from app.ai.model_registry import registry
+from app.models.application import Application
+from app.models.job import JobOffer
+from app.models.job_stats import JobApplicationStats
+from app.models.match_score import MatchScore
+from app.models.resume_features import ResumeFeatures
+from app.models.scoring_task import ScoringTask
+from app.services.ingestion_service import IngestionService
+from conftest import create_user, login
+
+RESUME_HASH = 'a' * 64
+
+def setup_application(app):
+    recruiter = create_user('recruiter', 'recruiter')
+    candidate = create_user('candidate', 'candidate', resume_path='/uploads/resume.pdf', resume_hash=RESUME_HASH)
+    job = JobOffer(title='Python developer', description='Python, SQL', creator_id=recruiter.id)
+    db.session.add(job)
+    db.session.commit()
+    
+    matcher = registry.get(app.config['MODEL_PATH'])
+    db.session.add(MatchScore(
+        candidate_id=candidate.id, job_id=job.id, score=72.0,
+        model_version=matcher.model_version, resume_hash=RESUME_HASH
+    ))
+    db.session.commit()
+    return candidate, job
+
+def test_apply_job_records_the_stored_score(app, client, nlp):
+    candidate, job = setup_application(app)
+    login(client, candidate)
+    
+    response = client.post(f'/apply/{job.id}', data={'cover_letter': 'Hello'})
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/dashboard')
+    
+    application = Application.query.filter_by(applicant_id=candidate.id, job_id=job.id).one()
+    assert application.match_percentage == 72.0
+    assert application.resume_path == candidate.resume_path
+    
+    stats = JobApplicationStats.query.get(job.id)
+    assert stats.applications_count == 1
+    assert stats.score_sum == 72.0
+    
+    response = client.get('/applications')
+    assert response.status_code == 200
+    assert b'Python developer' in response.data
+
+def test_apply_job_twice_is_rejected(app, client, nlp):
+    candidate, job = setup_application(app)
+    login(client, candidate)
+    
+    client.post(f'/apply/{job.id}', data={'cover_letter': 'Hello'})
+    response = client.post(f'/apply/{job.id}', data={'cover_letter': 'Again'})
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/job-listings')
+    assert Application.query.filter_by(applicant_id=candidate.id, job_id=job.id).count() == 1
+
+def test_apply_job_page_renders(app, client, nlp):
+    candidate, job = setup_application(app)
+    login(client, candidate)
+    
+    response = client.get(f'/apply/{job.id}')
+    assert response.status_code == 200
+    assert b'72%' in response.data
+
+def test_job_listings_while_resume_is_queued(app, client, nlp, tmp_path):
+    candidate, job = setup_application(app)
+    resume = tmp_path / 'resume.txt'
+    resume.write_text('Python developer with SQL experience')
+    candidate.resume_path = str(resume)
+    candidate.resume_hash = None
+    IngestionService.enqueue(candidate.id, str(resume))
+    login(client, candidate)
+    
+    # The score of the previous resume is not served while the new one is queued
+    response = client.get('/job-listings')
+    assert response.status_code == 200
+    assert "en cours d'analyse".encode() in response.data
+    assert b'Correspondance' not in response.data
+    assert ResumeFeatures.query.count() == 0
+    
+    client.post(f'/apply/{job.id}', data={'cover_letter': 'Hello'})
+    application = Application.query.filter_by(applicant_id=candidate.id).one()
+    assert application.match_percentage is None
+    
+    # The ingestion worker processes the resume and scores the application
+    assert IngestionService.process(IngestionService.claim('test')) == 'done'
+    application = Application.query.get(application.id)
+    assert application.match_percentage is not None
+    assert MatchScore.query.filter_by(candidate_id=candidate.id, job_id=job.id).one().resume_hash == candidate.resume_hash
+
+def test_application_without_stored_score_is_scored_by_the_workers(app, client, nlp, tmp_path):
+    candidate, job = setup_application(app)
+    MatchScore.query.delete()
+    resume = tmp_path / 'resume.txt'
+    resume.write_text('Python developer with SQL experience')
+    candidate.resume_path = str(resume)
+    IngestionService.enqueue(candidate.id, str(resume))
+    assert IngestionService.process(IngestionService.claim('test')) == 'done'
+    MatchScore.query.delete()
+    login(client, candidate)
+    
+    # The request does not score the pair, it queues the job
+    client.post(f'/apply/{job.id}', data={'cover_letter': 'Hello'})
+    application = Application.query.filter_by(applicant_id=candidate.id).one()
+    assert application.match_percentage is None
+    assert MatchScore.query.count() == 0
+    
+    task = IngestionService.claim('test', ScoringTask)
+    assert task.job_id == job.id
+    assert IngestionService.process_scoring(task) == 'done'
+    assert Application.query.get(application.id).match_percentage is not None
+    assert JobApplicationStats.query.get(job.id).scored_count == 1
@@ -0,0 +1,27 @@
+import json
+import os
+import pandas as pd
+from app.ai.preprocessing import preprocess_dataset
+from app.ai.text_processor import TextProcessor
+
+def test_processed_cache_is_rebuilt_when_settings_change(nlp, tmp_path):
+    data_path = tmp_path / 'dataset.csv'
+    pd.DataFrame({
+        'Resume': ['Python developer', 'Accountant with Excel'],
+        'Job Description': ['Looking for Python', 'Looking for an accountant'],
+        'Best Match': [1, 1]
+    }).to_csv(data_path, index=False)
+    taxonomy_path = tmp_path / 'skills.json'
+    taxonomy_path.write_text(json.dumps({'skills': [{'name': 'excel'}]}))
+    cache_path = str(tmp_path / 'processed.parquet')
+    
+    def run(**settings):
+        preprocess_dataset(
+            str(data_path), cache_path=cache_path, workers=1,
+            processor=TextProcessor(fast_tokenizer=True, **settings)
+        )
+        return os.stat(cache_path).st_mtime_ns
+    
+    built = run()
+    assert run() == built
+    assert run(skill_taxonomy_path=str(taxonomy_path)) != built
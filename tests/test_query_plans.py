@@ -0,0 +1,27 @@
+import pytest
+from app.services.query_plan_service import QueryPlanService
+
+QUERY_NAMES = [
+    'applications page by score',
+    'applications of a candidate',
+    'existing application',
+    'recruiter dashboard',
+    'active job listing',
+    'notification feed',
+    'unread notification feed',
+    'match scores of a job',
+    'match scores of a candidate',
+    'top matches of a job',
+    'top matches of a candidate',
+    'resume features by hash',
+    'candidates by resume hash',
+]
+
+def test_every_hot_query_is_checked(app):
+    assert [name for name, query in QueryPlanService.hot_queries()] == QUERY_NAMES
+
+@pytest.mark.parametrize('name', QUERY_NAMES)
+def test_hot_query_uses_an_index(app, name):
+    query = dict(QueryPlanService.hot_queries())[name]
+    plan = QueryPlanService.explain(query)
+    assert QueryPlanService.problems(plan) == [], '\n'.join(plan)
@@ -0,0 +1,99 @@
+from app import db
+from app.models.job import JobOffer
+from app.ai.model_registry import registry
+from app.models.job_features import JobFeatures
+from app.models.match_score import MatchScore
+from app.models.scoring_task import ScoringTask
+from app.services.ingestion_service import IngestionService
+from conftest import create_user, login
+
+JOB_FORM = {
+    'title': 'Data engineer',
+    'description': 'Build data pipelines with Python and SQL.',
+    'requirements': 'Python, SQL, Airflow',
+    'location': 'Paris',
+    'salary_range': '50-60k',
+}
+
+def run_scoring_tasks():
+    while True:
+        task = IngestionService.claim('test', ScoringTask)
+        if task is None:
+            return
+        assert IngestionService.process_scoring(task) == 'done'
+
+def test_post_job_queues_features(app, client, nlp):
+    recruiter = create_user('recruiter', 'recruiter')
+    login(client, recruiter)
+    
+    response = client.post('/post-job', data=JOB_FORM)
+    assert response.status_code == 302
+    
+    # The request only queues the job; the workers compute its features
+    job = JobOffer.query.one()
+    assert job.creator_id == recruiter.id
+    assert ScoringTask.query.filter_by(job_id=job.id, status='pending').count() == 1
+    assert JobFeatures.query.count() == 0
+    
+    run_scoring_tasks()
+    features = JobFeatures.query.filter_by(job_id=job.id).one()
+    assert features.content_hash == job.content_hash()
+
+def test_edit_job_refreshes_features(app, client, nlp):
+    recruiter = create_user('recruiter', 'recruiter')
+    login(client, recruiter)
+    client.post('/post-job', data=JOB_FORM)
+    run_scoring_tasks()
+    job = JobOffer.query.one()
+    
+    assert client.get(f'/jobs/{job.id}/edit').status_code == 200
+    response = client.post(f'/jobs/{job.id}/edit', data=dict(JOB_FORM, description='Build ML platforms.', is_active='on'))
+    assert response.status_code == 302
+    
+    run_scoring_tasks()
+    job = JobOffer.query.one()
+    assert job.description == 'Build ML platforms.'
+    assert JobFeatures.query.filter_by(job_id=job.id).one().content_hash == job.content_hash()
+
+def test_edit_job_of_another_recruiter_is_denied(app, client):
+    owner = create_user('owner', 'recruiter')
+    other = create_user('other', 'recruiter')
+    job = JobOffer(title='Job', description='Text', creator_id=owner.id)
+    db.session.add(job)
+    db.session.commit()
+    
+    login(client, other)
+    response = client.post(f'/jobs/{job.id}/edit', data=JOB_FORM)
+    assert response.status_code == 302
+    assert JobOffer.query.get(job.id).description == 'Text'
+
+def test_top_candidates_reads_stored_scores(app, client, nlp):
+    recruiter = create_user('recruiter', 'recruiter')
+    job = JobOffer(title='Job', description='Text', creator_id=recruiter.id)
+    db.session.add(job)
+    db.session.commit()
+    
+    model_version = registry.get(app.config['MODEL_PATH']).model_version
+    for name, score, scored_hash, current_hash in (
+        ('ann', 80.0, 'a' * 64, 'a' * 64),
+        ('bob', 60.0, 'b' * 64, 'b' * 64),
+        # Scored from a resume that was replaced since
+        ('eve', 90.0, 'e' * 64, 'f' * 64),
+    ):
+        candidate = create_user(name, 'candidate', resume_path=f'/uploads/{name}.pdf', resume_hash=current_hash)
+        db.session.add(MatchScore(
+            candidate_id=candidate.id, job_id=job.id, score=score,
+            model_version=model_version, resume_hash=scored_hash
+        ))
+    db.session.commit()
+    login(client, recruiter)
+    
+    response = client.get(f'/jobs/{job.id}/candidates')
+    assert response.status_code == 200
+    assert b'(ann)' in response.data and b'(bob)' in response.data
+    assert b'(eve)' not in response.data
+    assert response.data.index(b'(ann)') < response.data.index(b'(bob)')
+    
+    response = client.get(f'/jobs/{job.id}/candidates?k=0')
+    assert b'(ann)' in response.data and b'(bob)' not in response.data
+    assert ScoringTask.query.count() == 0
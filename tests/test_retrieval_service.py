@@ -0,0 +1,41 @@
+from app import db
+from app.cli import prepare_features
+from app.models.job import JobOffer
+from app.models.job_features import JobFeatures
+from app.models.user import User
+from app.services.feature_store_service import FeatureStoreService
+from app.services.ingestion_service import IngestionService
+from conftest import create_user
+
+def test_prepare_features_backfills_resume_hashes(app, nlp, tmp_path):
+    resume = tmp_path / 'resume.txt'
+    resume.write_text('Python developer')
+    processed = create_user('ann', 'candidate', resume_path=str(resume))
+    queued = create_user('bob', 'candidate', resume_path=str(resume))
+    IngestionService.enqueue(queued.id, str(resume))
+    
+    result = app.test_cli_runner().invoke(prepare_features, ['--batch-size', '1'])
+    assert result.exit_code == 0, result.output
+    assert 'Hashed 1 resumes' in result.output
+    
+    # The ingestion worker hashes the queued upload once it is processed
+    assert User.query.get(processed.id).resume_hash == FeatureStoreService.hash_file(str(resume))
+    assert User.query.get(queued.id).resume_hash is None
+
+def test_prepare_features_featurizes_active_jobs(app, nlp):
+    recruiter = create_user('recruiter', 'recruiter')
+    jobs = [
+        JobOffer(title=f'Job {i}', description='Python and SQL', creator_id=recruiter.id, is_active=i < 3)
+        for i in range(4)
+    ]
+    db.session.add_all(jobs)
+    db.session.commit()
+    
+    result = app.test_cli_runner().invoke(prepare_features, ['--batch-size', '2'])
+    assert result.exit_code == 0, result.output
+    assert 'Recomputed features of 3 jobs' in result.output
+    assert {record.job_id for record in JobFeatures.query} == {job.id for job in jobs[:3]}
+    
+    # Features that are up to date are left alone
+    result = app.test_cli_runner().invoke(prepare_features)
+    assert 'Recomputed features of 0 jobs' in result.output
@@ -0,0 +1,12 @@
+import pytest
+from app.ai.text_processor import ensure_nltk_data
+from app.ai.tokenizer_parity import SAMPLE_CORPUS, compare_texts
+
+def test_fast_tokenizer_matches_nltk_on_sample_corpus():
+    # The reference pipeline needs every NLTK resource, punkt included
+    try:
+        ensure_nltk_data()
+    except LookupError as e:
+        pytest.skip(str(e))
+    
+    assert compare_texts(SAMPLE_CORPUS) == []